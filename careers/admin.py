@@ -10,6 +10,8 @@ from .models import (
     CareerAnswer,
     CareerResult,
     CareerRecommendation,
+    RiasecDailyStat,
+    QuestionStat,
 )
 
 
@@ -87,3 +89,26 @@ class CareerResultAdmin(admin.ModelAdmin):
 class CareerRecommendationAdmin(admin.ModelAdmin):
     list_display = ['code']
     search_fields = ['code', 'description']
+
+
+@admin.register(RiasecDailyStat)
+class RiasecDailyStatAdmin(admin.ModelAdmin):
+    list_display = ['date', 'code', 'primary_code', 'count']
+    list_filter = ['primary_code']
+    date_hierarchy = 'date'
+
+
+@admin.register(QuestionStat)
+class QuestionStatAdmin(admin.ModelAdmin):
+    list_display = ['question', 'answer_count', 'pick_count', 'mean_score', 'primary_correlation', 'updated_at']
+    list_filter = ['question__category']
+    readonly_fields = [
+        'question',
+        'option_counts',
+        'answer_count',
+        'score_sum',
+        'score_square_sum',
+        'primary_match_count',
+        'primary_match_score_sum',
+        'updated_at',
+    ]
@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import CareerResult, RiasecDailyStat
+
+
+def result_code(result):
+    return f"{result.primary_code}{result.secondary_code}{result.tertiary_code}"
+
+
+def record_result(result, date=None):
+    """Add one completed assessment to the daily RIASEC aggregates"""
+    code = result_code(result)
+    if len(code) != 3:
+        return
+    date = date or timezone.localdate()
+    stat, created = RiasecDailyStat.objects.get_or_create(
+        date=date,
+        code=code,
+        defaults={'primary_code': code[0], 'count': 1},
+    )
+    if not created:
+        RiasecDailyStat.objects.filter(pk=stat.pk).update(count=F('count') + 1)
+
+
+def move_result(previous_code, previous_date, result, date=None):
+    """Move a rescored assessment from its previous code and day to its new ones"""
+    if len(previous_code) == 3 and previous_date:
+        RiasecDailyStat.objects.filter(date=previous_date, code=previous_code, count__gt=0).update(
+            count=F('count') - 1
+        )
+    record_result(result, date)
+
+
+def rebuild_riasec_stats():
+    """Recompute every aggregate row from CareerResult, returning the rows written"""
+    rows = (
+        CareerResult.objects.filter(assessment__date_completed__isnull=False)
+        .annotate(date=TruncDate('assessment__date_completed'))
+        .values('date', 'primary_code', 'secondary_code', 'tertiary_code')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    stats = {}
+    for row in rows:
+        code = f"{row['primary_code']}{row['secondary_code']}{row['tertiary_code']}"
+        if len(code) != 3:
+            continue
+        key = (row['date'], code)
+        stats[key] = stats.get(key, 0) + row['total']
+
+    with transaction.atomic():
+        RiasecDailyStat.objects.all().delete()
+        RiasecDailyStat.objects.bulk_create(
+            [
+                RiasecDailyStat(date=date, code=code, primary_code=code[0], count=count)
+                for (date, code), count in stats.items()
+            ],
+            batch_size=1000,
+        )
+    return len(stats)
+
+
+def riasec_summary(start=None, end=None):
+    """Totals per code, per primary letter and per day over an optional date range"""
+    stats = RiasecDailyStat.objects.all()
+    if start:
+        stats = stats.filter(date__gte=start)
+    if end:
+        stats = stats.filter(date__lte=end)
+
+    by_code = list(stats.values('code').annotate(total=Sum('count')).order_by('-total', 'code'))
+    by_primary = list(stats.values('primary_code').annotate(total=Sum('count')).order_by('-total', 'primary_code'))
+    by_day = list(stats.values('date').annotate(total=Sum('count')).order_by('date'))
+    return {
+        'total': sum(item['total'] for item in by_day),
+        'by_code': by_code,
+        'by_primary': by_primary,
+        'by_day': by_day,
+    }
@@ -0,0 +1,16 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+
+
+def get_cache_version(key):
+    """Return the current version stamp stored under ``key``, creating one if needed"""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(key):
+    cache.set(key, uuid4().hex, None)
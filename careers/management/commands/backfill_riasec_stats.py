@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from careers.analytics import rebuild_riasec_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily RIASEC code aggregates from stored career results."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding RIASEC aggregates...")
+        rows = rebuild_riasec_stats()
+        self.stdout.write(self.style.SUCCESS(f"RIASEC aggregates rebuilt ({rows} rows)."))
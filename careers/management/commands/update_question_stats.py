@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from careers.question_stats import (
+    ANSWER_SOURCE,
+    DISCOVERY_ANSWER_SOURCE,
+    RESULT_SOURCE,
+    reset_question_stats,
+    update_question_stats,
+)
+
+
+class Command(BaseCommand):
+    help = "Fold new and edited career discovery answers into the per-question statistics."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Discard stored statistics and recompute them from all answers.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows read from each source per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            self.stdout.write("Discarding stored question statistics...")
+            reset_question_stats()
+
+        processed = update_question_stats(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Question statistics updated ({processed[RESULT_SOURCE]} results, "
+                f"{processed[ANSWER_SOURCE]} answers, "
+                f"{processed[DISCOVERY_ANSWER_SOURCE]} discovery answers)."
+            )
+        )
@@ -0,0 +1,102 @@
+from itertools import permutations
+
+from django.core.cache import cache
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .cache_versions import bump_cache_version, get_cache_version
+from .models import Career, CareerProgram
+
+
+RIASEC_LETTERS = 'RIASEC'
+MATCH_MAX_SCORE = 7
+MATCH_INDEX_VERSION_CACHE_KEY = 'careers:match_index:version'
+MATCH_INDEX_CACHE_KEY = 'careers:match_index:{version}'
+MATCH_INDEX_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Process-local ``(version, index)`` copy so results pages skip unpickling the index.
+# Replaced in one assignment so concurrent readers never pair a version with another index.
+_local_index = (None, {})
+
+
+def parse_riasec_codes(value):
+    """Split a comma-separated RIASEC string into upper-case codes"""
+    return [code.strip().upper() for code in (value or '').split(',') if code.strip()]
+
+
+def score_career(primary, secondary_codes, top_three):
+    """Score a career's RIASEC profile against a respondent's top three codes"""
+    score = 0
+    if primary:
+        if primary == top_three[0]:
+            score += 5
+        elif primary == top_three[1]:
+            score += 3
+        elif primary == top_three[2]:
+            score += 2
+    for code in secondary_codes:
+        if code in top_three:
+            score += 1
+    return score
+
+
+def build_match_index():
+    """Rank every RIASEC-tagged career for each of the 120 possible top-three codes"""
+    careers = [
+        (career_id, primary, parse_riasec_codes(secondary))
+        for career_id, primary, secondary in (
+            Career.objects.exclude(riasec_primary='')
+            .exclude(riasec_primary__isnull=True)
+            .values_list('id', 'riasec_primary', 'riasec_secondary')
+        )
+    ]
+    index = {}
+    for top_three in permutations(RIASEC_LETTERS, 3):
+        ranked = []
+        for career_id, primary, secondary_codes in careers:
+            score = score_career(primary, secondary_codes, top_three)
+            ranked.append((career_id, score, int((score / MATCH_MAX_SCORE) * 100)))
+        # Stable sort keeps the Career.Meta ordering for equal percentages.
+        ranked.sort(key=lambda item: item[2], reverse=True)
+        index[''.join(top_three)] = ranked
+    return index
+
+
+def get_match_index():
+    global _local_index
+    version = get_cache_version(MATCH_INDEX_VERSION_CACHE_KEY)
+    local_version, local_index = _local_index
+    if local_version == version:
+        return local_index
+    cache_key = MATCH_INDEX_CACHE_KEY.format(version=version)
+    index = cache.get(cache_key)
+    if index is None:
+        index = build_match_index()
+        cache.set(cache_key, index, MATCH_INDEX_CACHE_TIMEOUT)
+    _local_index = (version, index)
+    return index
+
+
+def bump_match_index_version():
+    bump_cache_version(MATCH_INDEX_VERSION_CACHE_KEY)
+
+
+def match_careers(riasec_code):
+    """Return ``(career_id, score, percentage)`` tuples ranked for a top-three code"""
+    return get_match_index().get(riasec_code, [])
+
+
+def load_top_programs(career_ids, level='', limit=3):
+    """Fetch up to ``limit`` programs per career in one windowed query"""
+    programs = {career_id: [] for career_id in career_ids}
+    if not programs:
+        return programs
+    program_qs = CareerProgram.objects.filter(career_id__in=programs)
+    if level:
+        program_qs = program_qs.filter(level=level)
+    program_qs = program_qs.annotate(
+        rank=Window(RowNumber(), partition_by=[F('career_id')], order_by=F('id').asc()),
+    ).filter(rank__lte=limit).order_by('career_id', 'id')
+    for program in program_qs:
+        programs[program.career_id].append(program)
+    return programs
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0005_careerrecommendation_careercategory_code_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiasecDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('code', models.CharField(max_length=3)),
+                ('primary_code', models.CharField(max_length=1)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date', 'code'],
+                'indexes': [models.Index(fields=['primary_code', 'date'], name='careers_ria_primary_24780b_idx')],
+                'unique_together': {('date', 'code')},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0006_riasecdailystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStatWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, unique=True)),
+                ('last_id', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='QuestionStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('option_counts', models.JSONField(blank=True, default=dict, help_text='Option id to number of picks')),
+                ('answer_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.PositiveBigIntegerField(default=0)),
+                ('score_square_sum', models.PositiveBigIntegerField(default=0)),
+                ('primary_match_count', models.PositiveIntegerField(default=0, help_text="Answers whose final primary code is this question's category")),
+                ('primary_match_score_sum', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='careers.careerquestion')),
+            ],
+            options={
+                'ordering': ['question__order', 'question_id'],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:11
+
+from django.db import migrations, models
+
+
+SEARCH_CONFIG = 'english'
+SEARCH_INDEX_NAME = 'career_search_document_gin'
+
+
+def populate_search_documents(apps, schema_editor):
+    Career = apps.get_model('careers', 'Career')
+    CareerProgram = apps.get_model('careers', 'CareerProgram')
+    program_names = {}
+    for career_id, name in CareerProgram.objects.values_list('career_id', 'name'):
+        program_names.setdefault(career_id, []).append(name)
+    careers = list(Career.objects.all())
+    for career in careers:
+        career.search_document = '\n'.join(
+            [career.title, career.overview, career.skills, *program_names.get(career.id, [])]
+        )
+    Career.objects.bulk_update(careers, ['search_document'], batch_size=500)
+
+
+def _search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector('search_document', config=SEARCH_CONFIG), name=SEARCH_INDEX_NAME)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.add_index(apps.get_model('careers', 'Career'), _search_index())
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('careers', 'Career'), _search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0007_questionstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='career',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False, help_text='Title, overview, skills and program names, kept in sync for search'),
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_result_codes(apps, schema_editor):
+    CareerAssessment = apps.get_model('careers', 'CareerAssessment')
+    assessments = list(CareerAssessment.objects.filter(result__isnull=False).select_related('result'))
+    for assessment in assessments:
+        result = assessment.result
+        assessment.result_code = f"{result.primary_code}{result.secondary_code}{result.tertiary_code}"
+        assessment.result_scores = {
+            'R': result.realistic_score,
+            'I': result.investigative_score,
+            'A': result.artistic_score,
+            'S': result.social_score,
+            'E': result.enterprising_score,
+            'C': result.conventional_score,
+        }
+    CareerAssessment.objects.bulk_update(assessments, ['result_code', 'result_scores'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0008_career_search_document'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='careerassessment',
+            name='result_code',
+            field=models.CharField(blank=True, help_text='Top-three RIASEC code, set on completion', max_length=3),
+        ),
+        migrations.AddField(
+            model_name='careerassessment',
+            name='result_scores',
+            field=models.JSONField(blank=True, default=dict, help_text='RIASEC letter to score, set on completion'),
+        ),
+        migrations.AddIndex(
+            model_name='careerassessment',
+            index=models.Index(fields=['user', 'status', '-date_started', '-id'], name='assessment_user_history_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='careerassessment',
+            index=models.Index(fields=['session_key', 'status', '-date_started', '-id'], name='assessment_session_history_idx'),
+        ),
+        migrations.RunPython(backfill_result_codes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:45
+
+from django.db import migrations, models
+
+
+def reset_question_stats(apps, schema_editor):
+    # Existing totals cannot be tied to the rows that produced them, so the
+    # next update_question_stats run recounts every answer from scratch.
+    apps.get_model('careers', 'QuestionStat').objects.all().delete()
+    apps.get_model('careers', 'QuestionStatWatermark').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0009_assessment_result_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='careeranswer',
+            name='counted_primary_match',
+            field=models.BooleanField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='careeranswer',
+            name='counted_score',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='careeranswer',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='careerdiscoveryanswer',
+            name='counted_option_id',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='careerdiscoveryanswer',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='careerresult',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='questionstatwatermark',
+            name='last_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(reset_question_stats, migrations.RunPython.noop),
+    ]
@@ -37,6 +37,7 @@ class Career(models.Model):
     ]
     riasec_primary = models.CharField(max_length=1, choices=RIASEC_CHOICES, blank=True)
     riasec_secondary = models.CharField(max_length=10, blank=True, help_text="Comma-separated secondary RIASEC codes, e.g. I,A")
+    search_document = models.TextField(blank=True, editable=False, help_text="Title, overview, skills and program names, kept in sync for search")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -125,6 +126,9 @@ class CareerDiscoveryAnswer(models.Model):
     response = models.ForeignKey(CareerDiscoveryResponse, on_delete=models.CASCADE, related_name='answers')
     question = models.ForeignKey(CareerQuestion, on_delete=models.CASCADE)
     option = models.ForeignKey(CareerOption, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Option this row last added to QuestionStat; None until update_question_stats counts it.
+    counted_option_id = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
 
     class Meta:
         unique_together = ['response', 'question']
@@ -150,9 +154,15 @@ class CareerAssessment(models.Model):
     date_started = models.DateTimeField(auto_now_add=True)
     date_completed = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_progress')
+    result_code = models.CharField(max_length=3, blank=True, help_text="Top-three RIASEC code, set on completion")
+    result_scores = models.JSONField(default=dict, blank=True, help_text="RIASEC letter to score, set on completion")
 
     class Meta:
         ordering = ['-date_started']
+        indexes = [
+            models.Index(fields=['user', 'status', '-date_started', '-id'], name='assessment_user_history_idx'),
+            models.Index(fields=['session_key', 'status', '-date_started', '-id'], name='assessment_session_history_idx'),
+        ]
 
     def __str__(self):
         if self.user:
@@ -164,6 +174,10 @@ class CareerAnswer(models.Model):
     assessment = models.ForeignKey(CareerAssessment, on_delete=models.CASCADE, related_name='answers')
     question = models.ForeignKey(CareerQuestion, on_delete=models.CASCADE)
     score = models.PositiveSmallIntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # What this answer last added to QuestionStat; None until update_question_stats counts it.
+    counted_score = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    counted_primary_match = models.BooleanField(null=True, blank=True, editable=False)
 
     class Meta:
         unique_together = ['assessment', 'question']
@@ -183,6 +197,7 @@ class CareerResult(models.Model):
     primary_code = models.CharField(max_length=1)
     secondary_code = models.CharField(max_length=1)
     tertiary_code = models.CharField(max_length=1)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"Result {self.primary_code}{self.secondary_code}{self.tertiary_code} for assessment {self.assessment_id}"
@@ -198,3 +213,71 @@ class CareerRecommendation(models.Model):
 
     def __str__(self):
         return self.code
+
+
+class RiasecDailyStat(models.Model):
+    """Completed assessments per day and top-three RIASEC code"""
+    date = models.DateField()
+    code = models.CharField(max_length=3)
+    primary_code = models.CharField(max_length=1)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['date', 'code']
+        ordering = ['-date', 'code']
+        indexes = [
+            models.Index(fields=['primary_code', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.code}: {self.count}"
+
+
+class QuestionStat(models.Model):
+    """Running answer statistics for one question, maintained by update_question_stats"""
+    question = models.OneToOneField(CareerQuestion, on_delete=models.CASCADE, related_name='stats')
+    option_counts = models.JSONField(default=dict, blank=True, help_text="Option id to number of picks")
+    answer_count = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveBigIntegerField(default=0)
+    score_square_sum = models.PositiveBigIntegerField(default=0)
+    primary_match_count = models.PositiveIntegerField(default=0, help_text="Answers whose final primary code is this question's category")
+    primary_match_score_sum = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['question__order', 'question_id']
+
+    def __str__(self):
+        return f"Stats for {self.question}"
+
+    @property
+    def pick_count(self):
+        return sum(self.option_counts.values())
+
+    @property
+    def mean_score(self):
+        if not self.answer_count:
+            return None
+        return self.score_sum / self.answer_count
+
+    @property
+    def primary_correlation(self):
+        """Correlation between the score and ending with this category as primary code"""
+        n = self.answer_count
+        score_variance = n * self.score_square_sum - self.score_sum ** 2
+        match_variance = n * self.primary_match_count - self.primary_match_count ** 2
+        if not n or score_variance <= 0 or match_variance <= 0:
+            return None
+        covariance = n * self.primary_match_score_sum - self.score_sum * self.primary_match_count
+        return covariance / ((score_variance * match_variance) ** 0.5)
+
+
+class QuestionStatWatermark(models.Model):
+    """Last ``(updated_at, id)`` position of a source already folded into QuestionStat"""
+    source = models.CharField(max_length=50, unique=True)
+    last_updated_at = models.DateTimeField(null=True, blank=True)
+    last_id = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} @ {self.last_updated_at} #{self.last_id}"
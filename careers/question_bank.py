@@ -0,0 +1,53 @@
+from django.core.cache import cache
+
+from .cache_versions import bump_cache_version, get_cache_version
+from .models import CareerQuestion
+
+
+QUESTION_BANK_VERSION_CACHE_KEY = 'careers:question_bank:version'
+QUESTION_BANK_CACHE_KEY = 'careers:question_bank:{version}'
+QUESTION_BANK_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Process-local ``(version, questions)`` copy so questionnaire steps skip the cache round trip.
+# Replaced in one assignment so concurrent readers never pair a version with other questions.
+_local_bank = (None, {})
+
+
+def bump_question_bank_version():
+    bump_cache_version(QUESTION_BANK_VERSION_CACHE_KEY)
+
+
+def build_question_bank():
+    """Snapshot active questions, in display order, with their options prefetched"""
+    questions = CareerQuestion.objects.filter(is_active=True).prefetch_related('options')
+    return {question.id: question for question in questions}
+
+
+def get_question_bank():
+    global _local_bank
+    version = get_cache_version(QUESTION_BANK_VERSION_CACHE_KEY)
+    local_version, local_questions = _local_bank
+    if local_version == version:
+        return local_questions
+    cache_key = QUESTION_BANK_CACHE_KEY.format(version=version)
+    questions = cache.get(cache_key)
+    if questions is None:
+        questions = build_question_bank()
+        cache.set(cache_key, questions, QUESTION_BANK_CACHE_TIMEOUT)
+    _local_bank = (version, questions)
+    return questions
+
+
+def get_question_option(question, option_id):
+    """Find one of a bank question's options by its (string or int) id"""
+    for option in question.options.all():
+        if str(option.id) == str(option_id):
+            return option
+    return None
+
+
+def category_question_counts():
+    counts = {}
+    for question in get_question_bank().values():
+        counts[question.category] = counts.get(question.category, 0) + 1
+    return counts
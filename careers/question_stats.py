@@ -0,0 +1,205 @@
+from datetime import timedelta
+
+from django.db import transaction
+
+from core.pagination import keyset_filter
+from .models import (
+    CareerAnswer,
+    CareerDiscoveryAnswer,
+    CareerResult,
+    QuestionStat,
+    QuestionStatWatermark,
+)
+
+
+RESULT_SOURCE = 'career_result'
+ANSWER_SOURCE = 'career_answer'
+DISCOVERY_ANSWER_SOURCE = 'discovery_answer'
+
+# Each run restarts this far before the stored watermark, so rows saved just
+# before it but committed after the previous run are still picked up.
+# Recounting a row replaces its earlier contribution, so overlap is harmless.
+WATERMARK_OVERLAP = timedelta(minutes=10)
+
+
+def _new_delta():
+    return {
+        'option_counts': {},
+        'answer_count': 0,
+        'score_sum': 0,
+        'score_square_sum': 0,
+        'primary_match_count': 0,
+        'primary_match_score_sum': 0,
+    }
+
+
+def _fold_score(delta, score, primary_match, sign):
+    delta['answer_count'] += sign
+    delta['score_sum'] += sign * score
+    delta['score_square_sum'] += sign * score * score
+    if primary_match:
+        delta['primary_match_count'] += sign
+        delta['primary_match_score_sum'] += sign * score
+
+
+def _changed_since(queryset, cursor, batch_size, *fields):
+    """Next ``batch_size`` rows after ``cursor`` in ``(updated_at, id)`` order"""
+    queryset = keyset_filter(queryset, 'updated_at', cursor, descending=False)
+    return list(queryset.order_by('updated_at', 'pk').values_list('pk', 'updated_at', *fields)[:batch_size])
+
+
+def _recount_answers(deltas, answers):
+    """Replace what each answer last added to the stats with its current contribution
+
+    An answer counts once its assessment has a result.
+    """
+    rows = answers.values_list(
+        'id',
+        'question_id',
+        'score',
+        'question__category',
+        'assessment__result__id',
+        'assessment__result__primary_code',
+        'counted_score',
+        'counted_primary_match',
+    )
+    recounted = []
+    for answer_id, question_id, score, category, result_id, primary, counted_score, counted_match in rows:
+        current = (score, primary == category) if result_id else (None, None)
+        if current == (counted_score, counted_match):
+            continue
+        delta = deltas.setdefault(question_id, _new_delta())
+        if counted_score is not None:
+            _fold_score(delta, counted_score, counted_match, -1)
+        if result_id:
+            _fold_score(delta, score, current[1], 1)
+        recounted.append(CareerAnswer(id=answer_id, counted_score=current[0], counted_primary_match=current[1]))
+    # bulk_update leaves updated_at alone, so recounting never re-queues a row.
+    CareerAnswer.objects.bulk_update(recounted, ['counted_score', 'counted_primary_match'])
+
+
+def _collect_results(deltas, cursor, batch_size):
+    """Recount every answer of assessments whose result was saved after ``cursor``"""
+    results = _changed_since(CareerResult.objects.all(), cursor, batch_size, 'assessment_id')
+    if not results:
+        return cursor, 0
+    _recount_answers(deltas, CareerAnswer.objects.filter(assessment_id__in=[row[2] for row in results]))
+    last_id, last_updated_at, _ = results[-1]
+    return (last_updated_at, last_id), len(results)
+
+
+def _collect_answers(deltas, cursor, batch_size):
+    """Recount answers created or edited in place after ``cursor``"""
+    answers = _changed_since(CareerAnswer.objects.all(), cursor, batch_size)
+    if not answers:
+        return cursor, 0
+    _recount_answers(deltas, CareerAnswer.objects.filter(id__in=[row[0] for row in answers]))
+    last_id, last_updated_at = answers[-1]
+    return (last_updated_at, last_id), len(answers)
+
+
+def _collect_discovery_answers(deltas, cursor, batch_size):
+    """Move option picks recorded or changed after ``cursor`` to their current option"""
+    answers = _changed_since(
+        CareerDiscoveryAnswer.objects.all(), cursor, batch_size, 'question_id', 'option_id', 'counted_option_id'
+    )
+    if not answers:
+        return cursor, 0
+    recounted = []
+    for answer_id, _, question_id, option_id, counted_option_id in answers:
+        if option_id == counted_option_id:
+            continue
+        option_counts = deltas.setdefault(question_id, _new_delta())['option_counts']
+        if counted_option_id is not None:
+            option_counts[str(counted_option_id)] = option_counts.get(str(counted_option_id), 0) - 1
+        option_counts[str(option_id)] = option_counts.get(str(option_id), 0) + 1
+        recounted.append(CareerDiscoveryAnswer(id=answer_id, counted_option_id=option_id))
+    CareerDiscoveryAnswer.objects.bulk_update(recounted, ['counted_option_id'])
+    last_id, last_updated_at = answers[-1][:2]
+    return (last_updated_at, last_id), len(answers)
+
+
+COLLECTORS = {
+    RESULT_SOURCE: _collect_results,
+    ANSWER_SOURCE: _collect_answers,
+    DISCOVERY_ANSWER_SOURCE: _collect_discovery_answers,
+}
+
+
+def _apply_deltas(deltas):
+    existing = QuestionStat.objects.in_bulk(list(deltas), field_name='question_id')
+    to_create = []
+    to_update = []
+    for question_id, delta in deltas.items():
+        stat = existing.get(question_id)
+        if stat is None:
+            stat = QuestionStat(question_id=question_id)
+            to_create.append(stat)
+        else:
+            to_update.append(stat)
+        for option_id, picks in delta['option_counts'].items():
+            total = stat.option_counts.get(option_id, 0) + picks
+            if total > 0:
+                stat.option_counts[option_id] = total
+            else:
+                stat.option_counts.pop(option_id, None)
+        for field in ('answer_count', 'score_sum', 'score_square_sum', 'primary_match_count', 'primary_match_score_sum'):
+            setattr(stat, field, getattr(stat, field) + delta[field])
+    QuestionStat.objects.bulk_create(to_create)
+    QuestionStat.objects.bulk_update(
+        to_update,
+        [
+            'option_counts',
+            'answer_count',
+            'score_sum',
+            'score_square_sum',
+            'primary_match_count',
+            'primary_match_score_sum',
+        ],
+    )
+
+
+def _start_cursor(watermark):
+    if watermark.last_updated_at is None:
+        return None
+    return watermark.last_updated_at - WATERMARK_OVERLAP, 0
+
+
+def update_question_stats(batch_size=1000):
+    """Fold rows saved since the last run into QuestionStat, one batch per transaction
+
+    Returns the number of rows processed per source.
+    """
+    processed = {source: 0 for source in COLLECTORS}
+    cursors = None
+    while True:
+        with transaction.atomic():
+            for source in COLLECTORS:
+                QuestionStatWatermark.objects.get_or_create(source=source)
+            watermarks = {
+                watermark.source: watermark
+                for watermark in QuestionStatWatermark.objects.select_for_update().filter(source__in=COLLECTORS)
+            }
+            if cursors is None:
+                cursors = {source: _start_cursor(watermark) for source, watermark in watermarks.items()}
+            deltas = {}
+            batch_total = 0
+            for source, collect in COLLECTORS.items():
+                cursors[source], count = collect(deltas, cursors[source], batch_size)
+                if count:
+                    watermark = watermarks[source]
+                    watermark.last_updated_at, watermark.last_id = cursors[source]
+                    watermark.save(update_fields=['last_updated_at', 'last_id', 'updated_at'])
+                processed[source] += count
+                batch_total += count
+            _apply_deltas(deltas)
+        if not batch_total:
+            return processed
+
+
+def reset_question_stats():
+    with transaction.atomic():
+        QuestionStat.objects.all().delete()
+        QuestionStatWatermark.objects.all().delete()
+        CareerAnswer.objects.update(counted_score=None, counted_primary_match=None)
+        CareerDiscoveryAnswer.objects.update(counted_option_id=None)
@@ -0,0 +1,55 @@
+from django.core.cache import cache
+
+from .cache_versions import bump_cache_version, get_cache_version
+from .models import CareerOptionWeight
+
+
+WEIGHT_VERSION_CACHE_KEY = 'careers:option_weights:version'
+WEIGHT_MATRIX_CACHE_KEY = 'careers:option_weights:{version}'
+WEIGHT_MATRIX_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Process-local ``(version, rows)`` copy so repeated scoring skips the cache round trip.
+# Replaced in one assignment so concurrent readers never pair a version with other rows.
+_local_matrix = (None, {})
+
+
+def bump_weight_version():
+    bump_cache_version(WEIGHT_VERSION_CACHE_KEY)
+
+
+def build_weight_matrix():
+    """Load option -> career weights as sparse rows of ``(career_id, weight)`` pairs"""
+    rows = {}
+    for option_id, career_id, weight in CareerOptionWeight.objects.values_list('option_id', 'career_id', 'weight'):
+        rows.setdefault(option_id, []).append((career_id, weight))
+    return {option_id: tuple(row) for option_id, row in rows.items()}
+
+
+def get_weight_matrix():
+    global _local_matrix
+    version = get_cache_version(WEIGHT_VERSION_CACHE_KEY)
+    local_version, local_rows = _local_matrix
+    if local_version == version:
+        return local_rows
+    cache_key = WEIGHT_MATRIX_CACHE_KEY.format(version=version)
+    rows = cache.get(cache_key)
+    if rows is None:
+        rows = build_weight_matrix()
+        cache.set(cache_key, rows, WEIGHT_MATRIX_CACHE_TIMEOUT)
+    _local_matrix = (version, rows)
+    return rows
+
+
+def score_options(option_ids):
+    """Sum the weight rows of the selected options into per-career scores"""
+    rows = get_weight_matrix()
+    scores = {}
+    for option_id in option_ids:
+        for career_id, weight in rows.get(option_id, ()):
+            scores[career_id] = scores.get(career_id, 0) + weight
+    return scores
+
+
+def top_weighted_careers(option_ids, limit=5):
+    scores = score_options(option_ids)
+    return sorted(scores, key=scores.get, reverse=True)[:limit]
@@ -0,0 +1,208 @@
+import re
+from bisect import bisect_left
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+
+from .cache_versions import bump_cache_version, get_cache_version
+from .models import Career, CareerProgram
+
+
+SEARCH_CONFIG = 'english'
+SEARCH_INDEX_NAME = 'career_search_document_gin'
+SEARCH_INDEX_VERSION_CACHE_KEY = 'careers:search_index:version'
+SEARCH_INDEX_CACHE_KEY = 'careers:search_index:{version}'
+SEARCH_INDEX_CACHE_TIMEOUT = 60 * 60 * 24
+FIELD_WEIGHTS = (
+    ('title', 4),
+    ('skills', 2),
+    ('overview', 1),
+    ('programs', 1),
+)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Process-local ``(version, postings, sorted tokens)`` copy of the fallback index so
+# searches skip the cache round trip; replaced in one assignment.
+_local_index = (None, {}, [])
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall((text or '').lower())
+
+
+def uses_postgres_search():
+    return connection.vendor == 'postgresql'
+
+
+def build_search_document(career, program_names=()):
+    return '\n'.join([career.title, career.overview, career.skills, *program_names])
+
+
+def refresh_search_document(career_id):
+    """Rebuild one career's stored search document after its programs change"""
+    career = Career.objects.filter(pk=career_id).first()
+    if career is None:
+        return
+    program_names = career.programs.values_list('name', flat=True)
+    Career.objects.filter(pk=career_id).update(search_document=build_search_document(career, program_names))
+
+
+def bump_search_index_version():
+    bump_cache_version(SEARCH_INDEX_VERSION_CACHE_KEY)
+
+
+def build_inverted_index():
+    """Map each token to ``{career_id: weighted term frequency}`` for non-PostgreSQL databases"""
+    program_names = {}
+    for career_id, name in CareerProgram.objects.values_list('career_id', 'name'):
+        program_names.setdefault(career_id, []).append(name)
+
+    postings = {}
+    for career_id, title, overview, skills in Career.objects.values_list('id', 'title', 'overview', 'skills'):
+        fields = {
+            'title': title,
+            'skills': skills,
+            'overview': overview,
+            'programs': ' '.join(program_names.get(career_id, [])),
+        }
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(fields[field]):
+                career_scores = postings.setdefault(token, {})
+                career_scores[career_id] = career_scores.get(career_id, 0) + weight
+    return postings
+
+
+def _get_local_index():
+    global _local_index
+    version = get_cache_version(SEARCH_INDEX_VERSION_CACHE_KEY)
+    local_version, postings, tokens = _local_index
+    if local_version == version:
+        return postings, tokens
+    cache_key = SEARCH_INDEX_CACHE_KEY.format(version=version)
+    postings = cache.get(cache_key)
+    if postings is None:
+        postings = build_inverted_index()
+        cache.set(cache_key, postings, SEARCH_INDEX_CACHE_TIMEOUT)
+    tokens = sorted(postings)
+    _local_index = (version, postings, tokens)
+    return postings, tokens
+
+
+def get_inverted_index():
+    return _get_local_index()[0]
+
+
+def _prefix_scores(postings, tokens, prefix):
+    """Sum the postings of every indexed token starting with ``prefix``"""
+    scores = {}
+    position = bisect_left(tokens, prefix)
+    while position < len(tokens) and tokens[position].startswith(prefix):
+        for career_id, score in postings[tokens[position]].items():
+            scores[career_id] = scores.get(career_id, 0) + score
+        position += 1
+    return scores
+
+
+def rank_career_ids(query):
+    """Career ids matching every query token as a word prefix, best score first"""
+    postings, tokens = _get_local_index()
+    scores = None
+    for token in set(tokenize(query)):
+        token_scores = _prefix_scores(postings, tokens, token)
+        if scores is None:
+            scores = dict(token_scores)
+        else:
+            scores = {career_id: score + token_scores[career_id] for career_id, score in scores.items() if career_id in token_scores}
+        if not scores:
+            return []
+    if scores is None:
+        return []
+    return sorted(scores, key=lambda career_id: (-scores[career_id], career_id))
+
+
+class RankedCareerList:
+    """Sequence of careers in precomputed rank order, loading only the sliced rows"""
+
+    def __init__(self, career_ids, queryset):
+        self.career_ids = career_ids
+        self.queryset = queryset
+
+    def __len__(self):
+        return len(self.career_ids)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        career_ids = self.career_ids[index]
+        careers = self.queryset.in_bulk(career_ids)
+        return [careers[career_id] for career_id in career_ids if career_id in careers]
+
+
+def _facets(careers):
+    categories = (
+        careers.exclude(category__isnull=True)
+        .values('category__name', 'category__slug')
+        .annotate(total=Count('id'))
+        .order_by('category__name')
+    )
+    riasec_labels = dict(Career.RIASEC_CHOICES)
+    riasec = careers.exclude(riasec_primary='').values('riasec_primary').annotate(total=Count('id')).order_by('riasec_primary')
+    return {
+        'categories': [
+            {'name': item['category__name'], 'slug': item['category__slug'], 'total': item['total']}
+            for item in categories
+        ],
+        'riasec': [
+            {'code': item['riasec_primary'], 'label': riasec_labels.get(item['riasec_primary'], item['riasec_primary']), 'total': item['total']}
+            for item in riasec
+        ],
+    }
+
+
+def search_careers(query='', category='', riasec=''):
+    """Return ``(careers, facets)`` for the career library
+
+    ``careers`` is ranked by relevance when there is a query. It is a
+    queryset on PostgreSQL and a ``RankedCareerList`` elsewhere. Facet
+    counts cover every career matching the query, before the category and
+    RIASEC filters are applied.
+    """
+    careers = Career.objects.select_related('category')
+    ranked_ids = None
+    if query:
+        if uses_postgres_search():
+            from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+            vector = SearchVector('search_document', config=SEARCH_CONFIG)
+            search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+            tokens = tokenize(query)
+            if tokens:
+                # Also match partial words ("engin" -> Engineering), as the old icontains search did.
+                prefix_query = ' & '.join(f'{token}:*' for token in tokens)
+                search_query |= SearchQuery(prefix_query, config=SEARCH_CONFIG, search_type='raw')
+            careers = careers.annotate(search=vector).filter(search=search_query)
+            careers = careers.annotate(rank=SearchRank(vector, search_query)).order_by('-rank', 'title')
+        else:
+            ranked_ids = rank_career_ids(query)
+            careers = careers.filter(id__in=ranked_ids)
+
+    facets = _facets(careers)
+
+    if category:
+        careers = careers.filter(category__slug=category)
+    if riasec:
+        careers = careers.filter(riasec_primary=riasec)
+    if ranked_ids is not None:
+        if category or riasec:
+            allowed = set(careers.values_list('id', flat=True))
+            ranked_ids = [career_id for career_id in ranked_ids if career_id in allowed]
+        careers = RankedCareerList(ranked_ids, Career.objects.select_related('category'))
+    return careers, facets
+
+
+def search_querystring(query='', category='', riasec=''):
+    params = {key: value for key, value in (('search', query), ('category', category), ('riasec', riasec)) if value}
+    return urlencode(params)
@@ -0,0 +1,58 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .analytics import record_result
+from .matching import bump_match_index_version
+from .models import (
+    Career,
+    CareerOption,
+    CareerOptionWeight,
+    CareerProgram,
+    CareerQuestion,
+    CareerResult,
+)
+from .question_bank import bump_question_bank_version
+from .scoring import bump_weight_version
+from .search import build_search_document, bump_search_index_version, refresh_search_document
+
+
+@receiver(pre_save, sender=Career)
+def career_search_document(sender, instance, **kwargs):
+    program_names = instance.programs.values_list('name', flat=True) if instance.pk else []
+    instance.search_document = build_search_document(instance, program_names)
+
+
+@receiver(post_save, sender=Career)
+@receiver(post_delete, sender=Career)
+def career_changed(sender, **kwargs):
+    bump_match_index_version()
+    bump_search_index_version()
+
+
+@receiver(post_save, sender=CareerProgram)
+@receiver(post_delete, sender=CareerProgram)
+def career_program_changed(sender, instance, **kwargs):
+    refresh_search_document(instance.career_id)
+    bump_search_index_version()
+
+
+@receiver(post_save, sender=CareerOptionWeight)
+@receiver(post_delete, sender=CareerOptionWeight)
+def option_weight_changed(sender, **kwargs):
+    bump_weight_version()
+
+
+@receiver(post_save, sender=CareerQuestion)
+@receiver(post_delete, sender=CareerQuestion)
+@receiver(post_save, sender=CareerOption)
+@receiver(post_delete, sender=CareerOption)
+def question_bank_changed(sender, **kwargs):
+    bump_question_bank_version()
+
+
+@receiver(post_save, sender=CareerResult)
+def career_result_saved(sender, instance, created, **kwargs):
+    if created:
+        completed = instance.assessment.date_completed
+        record_result(instance, date=timezone.localdate(completed) if completed else None)
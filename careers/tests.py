@@ -0,0 +1,157 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    Career,
+    CareerAnswer,
+    CareerAssessment,
+    CareerDiscoveryAnswer,
+    CareerDiscoveryResponse,
+    CareerOption,
+    CareerQuestion,
+    CareerResult,
+    QuestionStat,
+    RiasecDailyStat,
+)
+from .question_stats import update_question_stats
+from .search import search_careers
+
+
+class UpdateQuestionStatsTests(TestCase):
+    def setUp(self):
+        self.question = CareerQuestion.objects.create(prompt='Fix engines?', category='R')
+        self.low = CareerOption.objects.create(question=self.question, text='No', value=1)
+        self.high = CareerOption.objects.create(question=self.question, text='Yes', value=5)
+        self.assessment = CareerAssessment.objects.create(session_key='s', status='completed')
+        CareerResult.objects.create(
+            assessment=self.assessment, primary_code='R', secondary_code='I', tertiary_code='A'
+        )
+        self.answer = CareerAnswer.objects.create(assessment=self.assessment, question=self.question, score=5)
+        self.response = CareerDiscoveryResponse.objects.create(session_key='s')
+        self.pick = CareerDiscoveryAnswer.objects.create(
+            response=self.response, question=self.question, option=self.high
+        )
+
+    def stat(self):
+        return QuestionStat.objects.get(question=self.question)
+
+    def test_counts_new_rows_once(self):
+        update_question_stats()
+        update_question_stats()
+        stat = self.stat()
+        self.assertEqual(stat.answer_count, 1)
+        self.assertEqual(stat.score_sum, 5)
+        self.assertEqual(stat.primary_match_count, 1)
+        self.assertEqual(stat.option_counts, {str(self.high.id): 1})
+
+    def test_answer_updated_in_place_replaces_its_contribution(self):
+        update_question_stats()
+        CareerAnswer.objects.update_or_create(
+            assessment=self.assessment, question=self.question, defaults={'score': 1}
+        )
+        update_question_stats()
+        stat = self.stat()
+        self.assertEqual(stat.answer_count, 1)
+        self.assertEqual(stat.score_sum, 1)
+        self.assertEqual(stat.score_square_sum, 1)
+        self.assertEqual(stat.primary_match_score_sum, 1)
+
+    def test_result_primary_code_change_is_recounted(self):
+        update_question_stats()
+        result = self.assessment.result
+        result.primary_code = 'S'
+        result.save()
+        update_question_stats()
+        stat = self.stat()
+        self.assertEqual(stat.answer_count, 1)
+        self.assertEqual(stat.primary_match_count, 0)
+        self.assertEqual(stat.primary_match_score_sum, 0)
+
+    def test_discovery_pick_changed_in_place_moves_the_count(self):
+        update_question_stats()
+        CareerDiscoveryAnswer.objects.bulk_create(
+            [CareerDiscoveryAnswer(response=self.response, question=self.question, option=self.low)],
+            update_conflicts=True,
+            unique_fields=['response', 'question'],
+            update_fields=['option', 'updated_at'],
+        )
+        update_question_stats()
+        self.assertEqual(self.stat().option_counts, {str(self.low.id): 1})
+
+    def test_row_committed_behind_the_watermark_is_still_counted(self):
+        update_question_stats()
+        other = CareerAssessment.objects.create(session_key='t', status='completed')
+        CareerResult.objects.create(assessment=other, primary_code='I', secondary_code='R', tertiary_code='A')
+        late = CareerAnswer.objects.create(assessment=other, question=self.question, score=3)
+        # Saved a moment before the last run's watermark, committed after it.
+        CareerAnswer.objects.filter(pk=late.pk).update(updated_at=timezone.now() - timedelta(minutes=1))
+        CareerResult.objects.filter(assessment=other).update(updated_at=timezone.now() - timedelta(minutes=1))
+        update_question_stats()
+        stat = self.stat()
+        self.assertEqual(stat.answer_count, 2)
+        self.assertEqual(stat.score_sum, 8)
+
+
+class SearchCareersTests(TestCase):
+    def setUp(self):
+        for title in ('Chemical Engineering', 'Software Engineering', 'Nursing'):
+            Career.objects.create(title=title, slug=title.lower().replace(' ', '-'))
+
+    def titles(self, query):
+        careers, _ = search_careers(query)
+        return sorted(career.title for career in careers[:10])
+
+    def test_partial_words_match_as_prefixes(self):
+        self.assertEqual(self.titles('engin'), ['Chemical Engineering', 'Software Engineering'])
+        self.assertEqual(self.titles('engineer'), ['Chemical Engineering', 'Software Engineering'])
+
+    def test_every_token_must_match(self):
+        self.assertEqual(self.titles('soft engin'), ['Software Engineering'])
+        self.assertEqual(self.titles('nursing engin'), [])
+
+
+@mock.patch('careers.views.random.shuffle', lambda items: None)
+class DiscoveryBackAndEditTests(TestCase):
+    def setUp(self):
+        self.options = []
+        for order, category in enumerate('RIASEC'):
+            question = CareerQuestion.objects.create(prompt=f'{category}?', category=category, order=order)
+            self.options.append({
+                value: CareerOption.objects.create(question=question, text=str(value), value=value)
+                for value in (1, 5)
+            })
+
+    def answer(self, step, value):
+        url = reverse('careers:discovery_questions')
+        self.client.post(f'{url}?step={step}', {'option': self.options[step - 1][value].id})
+
+    def result_code(self):
+        return self.client.get(reverse('careers:discovery_results')).context['riasec_code']
+
+    def test_changed_answers_rescore_a_completed_run(self):
+        for step, value in enumerate((5, 5, 5, 1, 1, 1), start=1):
+            self.answer(step, value)
+        self.assertEqual(self.result_code(), 'RIA')
+        self.assertEqual(self.result_code(), 'RIA')
+
+        # Back to the Investigative and Social steps, then on to the results again.
+        self.answer(2, 1)
+        self.answer(4, 5)
+        self.assertEqual(self.result_code(), 'RAS')
+
+        assessment = CareerAssessment.objects.get(id=self.client.session['career_assessment_id'])
+        self.assertEqual(assessment.result_code, 'RAS')
+        result = assessment.result
+        self.assertEqual((result.primary_code, result.secondary_code, result.tertiary_code), ('R', 'A', 'S'))
+        picks = dict(
+            CareerDiscoveryAnswer.objects.filter(
+                response_id=self.client.session['career_discovery_response_id']
+            ).values_list('question__category', 'option__value')
+        )
+        self.assertEqual(picks['I'], 1)
+        self.assertEqual(picks['S'], 5)
+        self.assertEqual(dict(RiasecDailyStat.objects.values_list('code', 'count')), {'RIA': 0, 'RAS': 1})
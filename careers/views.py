@@ -1,11 +1,17 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.utils import timezone
 from django.contrib import messages
-from django.db.models import Count
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
 import random
+from core.pagination import decode_cursor, keyset_page
+from .analytics import move_result
+from .matching import RIASEC_LETTERS, load_top_programs, match_careers
+from .question_bank import category_question_counts, get_question_bank, get_question_option
+from .scoring import score_options
+from .search import search_careers, search_querystring
 from .models import (
     Career,
-    CareerProgram,
     CareerQuestion,
     CareerOption,
     CareerOptionWeight,
@@ -18,18 +24,29 @@ from .models import (
 )
 
 
+DISCOVERY_QUESTION_COUNT = 30
+DISCOVERY_HISTORY_PAGE_SIZE = 20
+
+
 def career_list(request):
     """List all careers with search and filters"""
-    careers = Career.objects.all()
-    
-    query = request.GET.get('search', '')
-    if query:
-        careers = careers.filter(title__icontains=query)
-    
+    query = request.GET.get('search', '').strip()
+    category = request.GET.get('category', '').strip()
+    riasec = request.GET.get('riasec', '').strip().upper()
+    careers, facets = search_careers(query, category=category, riasec=riasec)
+
+    paginator = Paginator(careers, 12)
+    page_number = request.GET.get('page')
+    careers = paginator.get_page(page_number)
+
     context = {
         'page_title': 'Careers Library',
         'careers': careers,
+        'facets': facets,
         'search_query': query,
+        'active_category': category,
+        'active_riasec': riasec,
+        'search_querystring': search_querystring(query, category, riasec),
     }
     return render(request, 'careers/list.html', context)
 
@@ -52,24 +69,47 @@ def discovery_intro(request):
     return render(request, 'careers/discovery_intro.html', context)
 
 
+def _reset_discovery_session(request):
+    request.session.pop('career_discovery_answers', None)
+    request.session.pop('career_discovery_question_ids', None)
+    request.session.pop('career_assessment_id', None)
+    request.session.pop('career_discovery_response_id', None)
+
+
+def _start_discovery_assessment(request):
+    anonymous = request.session.get('career_discovery_anonymous', False)
+    user = request.user if request.user.is_authenticated and not anonymous else None
+    assessment = CareerAssessment.objects.create(
+        user=user,
+        session_key=request.session.session_key or '',
+        level='',
+        status='in_progress',
+    )
+    request.session['career_assessment_id'] = assessment.id
+    return assessment.id
+
+
+def _pick_discovery_questions(request, question_bank):
+    """Shuffle a new question set into the session, returning its ids"""
+    all_ids = list(question_bank)
+    random.shuffle(all_ids)
+    question_ids = all_ids[:DISCOVERY_QUESTION_COUNT]
+    request.session['career_discovery_question_ids'] = question_ids
+    return question_ids
+
+
 def discovery_questionnaire(request):
     step = int(request.GET.get('step', '1'))
-    base_qs = CareerQuestion.objects.filter(is_active=True).prefetch_related('options')
+    question_bank = get_question_bank()
     if request.method == 'POST' and step == 1:
-        request.session.pop('career_discovery_answers', None)
-        request.session.pop('career_discovery_question_ids', None)
-        request.session.pop('career_assessment_id', None)
+        _reset_discovery_session(request)
     question_ids = request.session.get('career_discovery_question_ids')
     if not question_ids:
-        all_ids = list(base_qs.values_list('id', flat=True))
-        if not all_ids:
+        question_ids = _pick_discovery_questions(request, question_bank)
+        if not question_ids:
             messages.error(request, 'Career discovery questions are not yet available.')
             return redirect('careers:discovery_intro')
-        random.shuffle(all_ids)
-        question_ids = all_ids[:30]
-        request.session['career_discovery_question_ids'] = question_ids
-    questions_map = {q.id: q for q in base_qs.filter(id__in=question_ids)}
-    ordered_questions = [questions_map[q_id] for q_id in question_ids if q_id in questions_map]
+    ordered_questions = [question_bank[q_id] for q_id in question_ids if q_id in question_bank]
     total = len(ordered_questions)
     if total == 0:
         messages.error(request, 'Career discovery questions are not yet available.')
@@ -90,28 +130,23 @@ def discovery_questionnaire(request):
         if not request.session.session_key:
             request.session.save()
 
-        assessment_id = request.session.get('career_assessment_id')
-        assessment = None
-        if assessment_id:
-            assessment = CareerAssessment.objects.filter(id=assessment_id).first()
-        if assessment is None:
-            anonymous = request.session.get('career_discovery_anonymous', False)
-            user = request.user if request.user.is_authenticated and not anonymous else None
-            assessment = CareerAssessment.objects.create(
-                user=user,
-                session_key=request.session.session_key or '',
-                level='',
-                status='in_progress',
-            )
-            request.session['career_assessment_id'] = assessment.id
+        assessment_id = request.session.get('career_assessment_id') or _start_discovery_assessment(request)
 
-        option = question.options.filter(id=selected_option_id).first()
+        option = get_question_option(question, selected_option_id)
         if option:
-            CareerAnswer.objects.update_or_create(
-                assessment=assessment,
-                question=question,
-                defaults={'score': option.value},
-            )
+            try:
+                CareerAnswer.objects.update_or_create(
+                    assessment_id=assessment_id,
+                    question=question,
+                    defaults={'score': option.value},
+                )
+            except IntegrityError:
+                # The session's assessment was deleted; start over with a fresh one.
+                CareerAnswer.objects.update_or_create(
+                    assessment_id=_start_discovery_assessment(request),
+                    question=question,
+                    defaults={'score': option.value},
+                )
 
         if step >= total:
             return redirect('careers:discovery_results')
@@ -131,34 +166,165 @@ def discovery_questionnaire(request):
     return render(request, 'careers/discovery_questionnaire.html', context)
 
 
+def discovery_questionnaire_all(request):
+    """Single-page questionnaire submitted as one batch of answers"""
+    question_bank = get_question_bank()
+    if request.method == 'POST':
+        question_ids = request.session.get('career_discovery_question_ids') or []
+    else:
+        _reset_discovery_session(request)
+        question_ids = _pick_discovery_questions(request, question_bank)
+    questions = [question_bank[q_id] for q_id in question_ids if q_id in question_bank]
+    if not questions:
+        messages.error(request, 'Career discovery questions are not yet available.')
+        return redirect('careers:discovery_intro')
+
+    selected_options = {}
+    if request.method == 'POST':
+        for question in questions:
+            option = get_question_option(question, request.POST.get(f'question_{question.id}'))
+            if option:
+                selected_options[question.id] = option
+
+        if len(selected_options) == len(questions):
+            if not request.session.session_key:
+                request.session.save()
+            anonymous = request.session.get('career_discovery_anonymous', False)
+            user = request.user if request.user.is_authenticated and not anonymous else None
+            riasec_scores, ranked_riasec = _score_riasec(
+                (question.category, selected_options[question.id].value) for question in questions
+            )
+            top_three = [item[0] for item in ranked_riasec[:3]]
+            with transaction.atomic():
+                assessment = CareerAssessment.objects.create(
+                    user=user,
+                    session_key=request.session.session_key or '',
+                    level='',
+                    status='completed',
+                    date_completed=timezone.now(),
+                    result_code=''.join(top_three),
+                    result_scores=riasec_scores,
+                )
+                CareerAnswer.objects.bulk_create([
+                    CareerAnswer(assessment=assessment, question_id=question_id, score=option.value)
+                    for question_id, option in selected_options.items()
+                ])
+                _save_career_result(assessment, riasec_scores, top_three)
+
+            request.session['career_assessment_id'] = assessment.id
+            request.session['career_discovery_answers'] = {
+                str(question_id): str(option.id) for question_id, option in selected_options.items()
+            }
+            return redirect('careers:discovery_results')
+
+        messages.error(request, 'Please answer every question to continue.')
+
+    context = {
+        'page_title': 'Career Discovery',
+        'questions': [
+            {
+                'question': question,
+                'selected_option_id': selected_options[question.id].id if question.id in selected_options else None,
+            }
+            for question in questions
+        ],
+        'total': len(questions),
+    }
+    return render(request, 'careers/discovery_questionnaire_all.html', context)
+
+
 def discovery_history(request):
     assessments_qs = CareerAssessment.objects.filter(status='completed')
     if request.user.is_authenticated:
         assessments_qs = assessments_qs.filter(user=request.user)
-    else:
-        if not request.session.session_key:
-            request.session.save()
+    elif request.session.session_key:
         assessments_qs = assessments_qs.filter(session_key=request.session.session_key)
+    else:
+        assessments_qs = assessments_qs.none()
 
-    assessments = []
-    for assessment in assessments_qs.select_related('result'):
-        code = ''
-        if getattr(assessment, 'result', None):
-            code = f"{assessment.result.primary_code}{assessment.result.secondary_code}{assessment.result.tertiary_code}"
-        assessments.append({
+    page, next_cursor = keyset_page(
+        assessments_qs.only('date_started', 'level', 'status', 'result_code'),
+        'date_started',
+        cursor=decode_cursor(request.GET.get('before')),
+        page_size=DISCOVERY_HISTORY_PAGE_SIZE,
+    )
+    assessments = [
+        {
             'date_started': assessment.date_started,
             'level': assessment.level,
-            'code': code,
+            'code': assessment.result_code,
             'status_label': assessment.get_status_display(),
-        })
+        }
+        for assessment in page
+    ]
 
     context = {
         'page_title': 'Career Discovery History',
         'assessments': assessments,
+        'next_cursor': next_cursor,
     }
     return render(request, 'careers/discovery_history.html', context)
 
 
+def _score_riasec(category_values):
+    """Sum answer values per RIASEC category and rank the categories"""
+    riasec_scores = {key: 0 for key in RIASEC_LETTERS}
+    for category, value in category_values:
+        if category in riasec_scores:
+            riasec_scores[category] += value
+    ranked_riasec = sorted(riasec_scores.items(), key=lambda x: x[1], reverse=True)
+    return riasec_scores, ranked_riasec
+
+
+def _save_career_result(assessment, riasec_scores, top_three):
+    return CareerResult.objects.update_or_create(
+        assessment=assessment,
+        defaults={
+            'realistic_score': riasec_scores.get('R', 0),
+            'investigative_score': riasec_scores.get('I', 0),
+            'artistic_score': riasec_scores.get('A', 0),
+            'social_score': riasec_scores.get('S', 0),
+            'enterprising_score': riasec_scores.get('E', 0),
+            'conventional_score': riasec_scores.get('C', 0),
+            'primary_code': top_three[0],
+            'secondary_code': top_three[1],
+            'tertiary_code': top_three[2],
+        },
+    )
+
+
+def _save_discovery_response(request, answers, option_qs, level):
+    """Persist the session answers once per questionnaire run"""
+    answer_pairs = {int(question_id): int(option_id) for question_id, option_id in answers.items()}
+    valid_question_ids = set(
+        CareerQuestion.objects.filter(id__in=answer_pairs).values_list('id', flat=True)
+    )
+    valid_option_ids = {option.id for option in option_qs}
+
+    with transaction.atomic():
+        response = None
+        response_id = request.session.get('career_discovery_response_id')
+        if response_id:
+            response = CareerDiscoveryResponse.objects.filter(id=response_id).first()
+        if response is None:
+            response = CareerDiscoveryResponse.objects.create(
+                session_key=request.session.session_key or 'anonymous',
+                level=level,
+            )
+            request.session['career_discovery_response_id'] = response.id
+        CareerDiscoveryAnswer.objects.bulk_create(
+            [
+                CareerDiscoveryAnswer(response=response, question_id=q_id, option_id=o_id)
+                for q_id, o_id in answer_pairs.items()
+                if q_id in valid_question_ids and o_id in valid_option_ids
+            ],
+            update_conflicts=True,
+            unique_fields=['response', 'question'],
+            update_fields=['option', 'updated_at'],
+        )
+    return response
+
+
 def discovery_results(request):
     answers = request.session.get('career_discovery_answers', {})
     if not answers:
@@ -187,21 +353,26 @@ def discovery_results(request):
         'C': 'You enjoy organizing, planning, and working with data or structured tasks.',
     }
 
-    riasec_scores = {key: 0 for key in riasec_labels}
-    for option in option_qs:
-        if not option.question_id:
-            continue
-        riasec_key = option.question.category
-        if riasec_key in riasec_scores:
-            riasec_scores[riasec_key] += option.value
-
-    ranked_riasec = sorted(riasec_scores.items(), key=lambda x: x[1], reverse=True)
+    assessment = None
+    assessment_id = request.session.get('career_assessment_id')
+    if assessment_id:
+        assessment = CareerAssessment.objects.filter(id=assessment_id).first()
+    riasec_scores, ranked_riasec = _score_riasec(
+        (option.question.category, option.value) for option in option_qs if option.question_id
+    )
+    # The batch POST or an earlier visit already saved these scores; answers
+    # changed after going Back rescore the run.
+    already_scored = (
+        assessment is not None
+        and assessment.status == 'completed'
+        and assessment.result_scores == riasec_scores
+    )
+    previous_result = None
+    if assessment is not None and assessment.status == 'completed' and not already_scored:
+        previous_result = (assessment.result_code, assessment.date_completed)
     top_three = [item[0] for item in ranked_riasec[:3]]
     riasec_code = ''.join(top_three)
-    question_counts = {
-        item['category']: item['total']
-        for item in CareerQuestion.objects.filter(is_active=True).values('category').annotate(total=Count('id'))
-    }
+    question_counts = category_question_counts()
     riasec_breakdown = []
     for code, score in ranked_riasec:
         max_score = (question_counts.get(code, 1) * 5)
@@ -224,10 +395,6 @@ def discovery_results(request):
     level = ''
     level_key = ''
 
-    assessment = None
-    assessment_id = request.session.get('career_assessment_id')
-    if assessment_id:
-        assessment = CareerAssessment.objects.filter(id=assessment_id).first()
     if assessment is None:
         anonymous = request.session.get('career_discovery_anonymous', False)
         user = request.user if request.user.is_authenticated and not anonymous else None
@@ -237,78 +404,58 @@ def discovery_results(request):
             level='',
             status='completed',
             date_completed=timezone.now(),
+            result_code=riasec_code,
+            result_scores=riasec_scores,
         )
         request.session['career_assessment_id'] = assessment.id
-    else:
+    elif not already_scored:
         assessment.status = 'completed'
         assessment.date_completed = timezone.now()
         assessment.level = ''
-        assessment.save(update_fields=['status', 'date_completed', 'level'])
-
-    CareerResult.objects.update_or_create(
-        assessment=assessment,
-        defaults={
-            'realistic_score': riasec_scores.get('R', 0),
-            'investigative_score': riasec_scores.get('I', 0),
-            'artistic_score': riasec_scores.get('A', 0),
-            'social_score': riasec_scores.get('S', 0),
-            'enterprising_score': riasec_scores.get('E', 0),
-            'conventional_score': riasec_scores.get('C', 0),
-            'primary_code': top_three[0],
-            'secondary_code': top_three[1],
-            'tertiary_code': top_three[2],
-        },
-    )
+        assessment.result_code = riasec_code
+        assessment.result_scores = riasec_scores
+        assessment.save(update_fields=['status', 'date_completed', 'level', 'result_code', 'result_scores'])
+
+    if not already_scored:
+        result, created = _save_career_result(assessment, riasec_scores, top_three)
+        if previous_result and not created:
+            previous_code, previous_completed = previous_result
+            move_result(
+                previous_code,
+                timezone.localdate(previous_completed) if previous_completed else None,
+                result,
+                date=timezone.localdate(assessment.date_completed),
+            )
 
+    ranked = match_careers(riasec_code)
+    weighted_scores = score_options(option_ids)
+    if weighted_scores:
+        # Option weights break ties between careers with the same RIASEC match.
+        ranked = sorted(ranked, key=lambda item: (-item[2], -weighted_scores.get(item[0], 0)))
+    best_ranked = [item for item in ranked if item[2] >= 70][:4]
+    alternative_ranked = [item for item in ranked if item[2] < 70][:4]
+    shown_ids = [item[0] for item in best_ranked + alternative_ranked]
+    careers_by_id = Career.objects.in_bulk(shown_ids)
+    programs_by_career = load_top_programs(shown_ids, level=level_key)
+    reasons = [riasec_explanations.get(code) for code in top_three if code in riasec_explanations]
     results = []
-    careers = Career.objects.exclude(riasec_primary='').exclude(riasec_primary__isnull=True)
-    max_score = 7
-    for career in careers:
-        secondary_codes = [code.strip().upper() for code in career.riasec_secondary.split(',') if code.strip()]
-        score = 0
-        if career.riasec_primary:
-            if career.riasec_primary == top_three[0]:
-                score += 5
-            elif career.riasec_primary == top_three[1]:
-                score += 3
-            elif career.riasec_primary == top_three[2]:
-                score += 2
-        for code in secondary_codes:
-            if code in top_three:
-                score += 1
-        percentage = int((score / max_score) * 100)
-        program_qs = CareerProgram.objects.filter(career=career)
-        if level_key:
-            program_qs = program_qs.filter(level=level_key)
-        reasons = [riasec_explanations.get(code) for code in top_three if code in riasec_explanations]
+    for career_id, score, percentage in best_ranked + alternative_ranked:
+        career = careers_by_id.get(career_id)
+        if career is None:
+            continue
         results.append({
             'career': career,
             'score': score,
             'percentage': percentage,
             'reasons': [reason for reason in reasons if reason][:2],
-            'programs': program_qs[:3],
+            'programs': programs_by_career.get(career_id, []),
         })
 
-    results = sorted(results, key=lambda x: x['percentage'], reverse=True)
-    best_matches = [item for item in results if item['percentage'] >= 70][:4]
-    alternatives = [item for item in results if item['percentage'] < 70][:4]
+    best_matches = [item for item in results if item['percentage'] >= 70]
+    alternatives = [item for item in results if item['percentage'] < 70]
 
-    response = CareerDiscoveryResponse.objects.create(
-        session_key=request.session.session_key or 'anonymous',
-        level=level,
-    )
-    for question_id, option_id in answers.items():
-        q_id = int(question_id)
-        o_id = int(option_id)
-        if not CareerQuestion.objects.filter(id=q_id).exists():
-            continue
-        if not CareerOption.objects.filter(id=o_id).exists():
-            continue
-        CareerDiscoveryAnswer.objects.create(
-            response=response,
-            question_id=q_id,
-            option_id=o_id,
-        )
+    if not (already_scored and request.session.get('career_discovery_response_id')):
+        _save_discovery_response(request, answers, option_qs, level)
 
     context = {
         'page_title': 'Career Discovery Results',
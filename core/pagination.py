@@ -0,0 +1,96 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(value, pk):
+    """Opaque, URL-safe cursor for a ``(value, pk)`` keyset position"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = f"{value}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, parse_value=datetime.fromisoformat):
+    """Return ``(value, pk)`` from a cursor, or ``None`` if it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        value, pk = raw.rsplit('|', 1)
+        return parse_value(value), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_filter(queryset, field, cursor, descending=True):
+    """Restrict ``queryset`` to rows after ``cursor`` in ``(field, pk)`` order"""
+    if cursor is None:
+        return queryset
+    value, pk = cursor
+    lookup = 'lt' if descending else 'gt'
+    return queryset.filter(
+        Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'pk__{lookup}': pk})
+    )
+
+
+def keyset_page(queryset, field, cursor=None, page_size=20, descending=True):
+    """Fetch one page in ``(field, pk)`` order
+
+    Returns ``(items, next_cursor)``; ``next_cursor`` is ``None`` on the last page.
+    """
+    prefix = '-' if descending else ''
+    queryset = keyset_filter(queryset, field, cursor, descending=descending)
+    items = list(queryset.order_by(f'{prefix}{field}', f'{prefix}pk')[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+    return items, next_cursor
+
+
+class KeysetPagination(BasePagination):
+    """DRF pagination over ``(ordering_field, pk)`` using opaque ``cursor`` tokens"""
+
+    ordering_field = 'created_at'
+    descending = True
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+
+    def get_page_size(self, request):
+        try:
+            return max(1, min(int(request.query_params[self.page_size_query_param]), self.max_page_size))
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        raw_cursor = request.query_params.get(self.cursor_query_param)
+        cursor = decode_cursor(raw_cursor)
+        if raw_cursor and cursor is None:
+            raise ValidationError({self.cursor_query_param: ['Invalid cursor.']})
+        items, self.next_cursor = keyset_page(
+            queryset,
+            self.ordering_field,
+            cursor=cursor,
+            page_size=self.get_page_size(request),
+            descending=self.descending,
+        )
+        return items
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import StudentCV, Message, Notification
+from .models import StudentCV, Message, Conversation, Notification
 
 
 @admin.register(StudentCV)
@@ -17,6 +17,13 @@ class MessageAdmin(admin.ModelAdmin):
     readonly_fields = ['attachment_size']
 
 
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    list_display = ['user_low', 'user_high', 'last_activity', 'unread_low', 'unread_high']
+    search_fields = ['user_low__username', 'user_high__username']
+    raw_id_fields = ['user_low', 'user_high', 'last_message']
+
+
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ['user', 'notification_type', 'title', 'is_read', 'created_at']
@@ -1,80 +1,169 @@
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 from django.conf import settings
+from django.utils.dateparse import parse_date
+from django.utils.formats import date_format
 from accounts.models import User
+from careers.analytics import riasec_summary
+from training.models import Course
+from training.ordering import REORDERABLE, reorder
+from core.pagination import decode_cursor
+from .chat_events import broker as chat_broker, chat_channel
+from .conversations import (
+    chat_history_page,
+    get_inbox_sequence,
+    inbox_page,
+    mark_conversation_read,
+    parse_sequence,
+    with_date_separators,
+)
 from .models import Message
 import json
 import os
 
 
-@login_required
-@require_http_methods(["GET"])
-def get_chat_messages(request, user_id):
-    """API endpoint to get messages for a chat conversation"""
-    try:
-        other_user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
-        return JsonResponse({'error': 'User not found'}, status=404)
-    
+def _last_message_id_param(request):
     # Get last message ID from request (for polling updates)
-    last_message_id = request.GET.get('last_message_id', 0)
     try:
-        last_message_id = int(last_message_id)
+        return int(request.GET.get('last_message_id', 0))
     except (ValueError, TypeError):
-        last_message_id = 0
+        return 0
+
+
+def _serialize_chat_message(request, user, msg):
+    message_data = {
+        'id': msg.id,
+        'sender_id': msg.sender.id,
+        'sender_name': msg.sender.get_full_name() or msg.sender.username,
+        'body': msg.body,
+        'created_at': msg.created_at.isoformat(),
+        'created_at_formatted': msg.created_at.strftime('%I:%M %p'),
+        'is_read': msg.is_read,
+        'is_sent': msg.sender == user,
+        'has_attachment': msg.has_attachment,
+    }
     
+    if msg.has_attachment:
+        message_data['attachment'] = {
+            'url': request.build_absolute_uri(msg.attachment.url) if msg.attachment else '',
+            'name': msg.attachment_name,
+            'size': msg.get_file_size_display(),
+            'extension': msg.get_file_extension(),
+        }
+    return message_data
+
+
+def _chat_messages_payload(request, user, other_user, last_message_id):
     # Get messages after the last message ID
     messages = Message.objects.filter(
-        Q(sender=request.user, recipient=other_user) |
-        Q(sender=other_user, recipient=request.user),
+        Q(sender=user, recipient=other_user) |
+        Q(sender=other_user, recipient=user),
         id__gt=last_message_id
     ).select_related('sender', 'recipient').order_by('created_at')
     
     # Mark new messages from other user as read
-    Message.objects.filter(
-        sender=other_user,
-        recipient=request.user,
-        id__gt=last_message_id,
-        is_read=False
-    ).update(is_read=True)
+    mark_conversation_read(user, other_user)
     
-    messages_data = []
-    for msg in messages:
-        message_data = {
-            'id': msg.id,
-            'sender_id': msg.sender.id,
-            'sender_name': msg.sender.get_full_name() or msg.sender.username,
-            'body': msg.body,
-            'created_at': msg.created_at.isoformat(),
-            'created_at_formatted': msg.created_at.strftime('%I:%M %p'),
-            'is_read': msg.is_read,
-            'is_sent': msg.sender == request.user,
-            'has_attachment': msg.has_attachment,
-        }
-        
-        if msg.has_attachment:
-            message_data['attachment'] = {
-                'url': request.build_absolute_uri(msg.attachment.url) if msg.attachment else '',
-                'name': msg.attachment_name,
-                'size': msg.get_file_size_display(),
-                'extension': msg.get_file_extension(),
-            }
-        
-        messages_data.append(message_data)
+    messages_data = [_serialize_chat_message(request, user, msg) for msg in messages]
     
     # Get last message ID in conversation (for future polling)
     last_msg = Message.objects.filter(
-        Q(sender=request.user, recipient=other_user) |
-        Q(sender=other_user, recipient=request.user)
+        Q(sender=user, recipient=other_user) |
+        Q(sender=other_user, recipient=user)
     ).order_by('-id').first()
     
-    return JsonResponse({
+    return {
         'messages': messages_data,
         'last_message_id': last_msg.id if last_msg else 0,
         'has_new': len(messages_data) > 0,
-    })
+    }
+
+
+@login_required
+@require_http_methods(["GET"])
+def get_chat_messages(request, user_id):
+    """API endpoint to get messages for a chat conversation"""
+    last_message_id = _last_message_id_param(request)
+    sequence = get_inbox_sequence(request.user.id)
+    if parse_sequence(request.GET.get('seq')) == sequence:
+        # Nothing was sent to or by this user since the client's last poll.
+        return JsonResponse({'messages': [], 'last_message_id': last_message_id, 'has_new': False, 'seq': sequence})
+    
+    try:
+        other_user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        return JsonResponse({'error': 'User not found'}, status=404)
+    
+    payload = _chat_messages_payload(request, request.user, other_user, last_message_id)
+    payload['seq'] = sequence
+    chat_broker.seed(chat_channel(request.user.id, other_user.id), payload['last_message_id'])
+    return JsonResponse(payload)
+
+
+@login_required
+@require_http_methods(["GET"])
+def get_chat_history(request, user_id):
+    """API endpoint for an older page of a chat, ending just before ``cursor``"""
+    try:
+        other_user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        return JsonResponse({'error': 'User not found'}, status=404)
+    
+    cursor = decode_cursor(request.GET.get('cursor'))
+    if cursor is None:
+        return JsonResponse({'error': 'A valid cursor is required'}, status=400)
+    
+    page, older_cursor = chat_history_page(request.user, other_user, cursor=cursor)
+    items = []
+    for item in with_date_separators(page):
+        if item['type'] == 'date_separator':
+            items.append({
+                'type': 'date_separator',
+                'date': item['date'].isoformat(),
+                'date_formatted': date_format(item['date'], 'F d, Y'),
+            })
+        else:
+            items.append({'type': 'message', **_serialize_chat_message(request, request.user, item['message'])})
+    return JsonResponse({'items': items, 'older_cursor': older_cursor})
+
+
+def _load_chat_messages(request, user, user_id, last_message_id):
+    try:
+        other_user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        return None
+    return _chat_messages_payload(request, user, other_user, last_message_id)
+
+
+async def chat_events(request, user_id):
+    """Long-poll endpoint: hold the request until the conversation has new messages
+
+    While the broker knows the conversation is unchanged, waiting and timing
+    out touch no tables beyond the session lookup.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+
+    last_message_id = _last_message_id_param(request)
+    channel = chat_channel(user.id, user_id)
+    latest = await chat_broker.alatest(channel)
+    if latest is not None and latest <= last_message_id:
+        await chat_broker.wait(channel, last_message_id, settings.CHAT_LONG_POLL_TIMEOUT)
+        latest = await chat_broker.alatest(channel)
+        if latest is None or latest <= last_message_id:
+            return JsonResponse({'messages': [], 'last_message_id': last_message_id, 'has_new': False})
+
+    payload = await sync_to_async(_load_chat_messages)(request, user, user_id, last_message_id)
+    if payload is None:
+        return JsonResponse({'error': 'User not found'}, status=404)
+    await chat_broker.aseed(channel, payload['last_message_id'])
+    return JsonResponse(payload)
 
 
 @login_required
@@ -156,54 +245,79 @@ def send_message_api(request, user_id):
 @require_http_methods(["GET"])
 def get_conversations(request):
     """API endpoint to get updated conversations list"""
-    from django.db.models import Max
+    sequence = get_inbox_sequence(request.user.id)
+    if parse_sequence(request.GET.get('seq')) == sequence and not request.GET.get('cursor'):
+        return JsonResponse({'unchanged': True, 'seq': sequence})
     
-    conversations_query = Message.objects.filter(
-        Q(sender=request.user) | Q(recipient=request.user)
-    ).values('sender', 'recipient').annotate(
-        last_message_time=Max('created_at')
-    ).order_by('-last_message_time')
+    entries, next_cursor = inbox_page(request.user, cursor=decode_cursor(request.GET.get('cursor')))
     
     conversations = []
-    seen_users = set()
-    
-    for conv in conversations_query:
-        if conv['sender'] == request.user.id:
-            other_user_id = conv['recipient']
-        else:
-            other_user_id = conv['sender']
-        
-        if other_user_id not in seen_users:
-            seen_users.add(other_user_id)
-            try:
-                conv_user = User.objects.get(id=other_user_id)
-                last_message = Message.objects.filter(
-                    Q(sender=request.user, recipient=conv_user) |
-                    Q(sender=conv_user, recipient=request.user)
-                ).order_by('-created_at').first()
-                
-                unread = Message.objects.filter(
-                    sender=conv_user,
-                    recipient=request.user,
-                    is_read=False
-                ).count()
-                
-                conversations.append({
-                    'user_id': conv_user.id,
-                    'user_name': conv_user.get_full_name() or conv_user.username,
-                    'user_role': conv_user.get_role_display(),
-                    'is_student': conv_user.is_student,
-                    'last_message': {
-                        'body': last_message.body if last_message else '',
-                        'created_at': last_message.created_at.strftime('%b %d') if last_message else '',
-                        'sender_id': last_message.sender.id if last_message else None,
-                    } if last_message else None,
-                    'unread_count': unread,
-                    'last_message_time': conv['last_message_time'].isoformat() if conv['last_message_time'] else None,
-                })
-            except User.DoesNotExist:
-                continue
-    
-    conversations.sort(key=lambda x: x['last_message_time'] or '', reverse=True)
+    for entry in entries:
+        conv_user = entry['user']
+        last_message = entry['last_message']
+        conversations.append({
+            'user_id': conv_user.id,
+            'user_name': conv_user.get_full_name() or conv_user.username,
+            'user_role': conv_user.get_role_display(),
+            'is_student': conv_user.is_student,
+            'last_message': {
+                'body': last_message.body,
+                'created_at': last_message.created_at.strftime('%b %d'),
+                'sender_id': last_message.sender_id,
+            } if last_message else None,
+            'unread_count': entry['unread_count'],
+            'last_message_time': entry['last_message_time'].isoformat(),
+        })
     
-    return JsonResponse({'conversations': conversations})
+    return JsonResponse({'conversations': conversations, 'next_cursor': next_cursor, 'seq': sequence})
+
+
+@login_required
+@require_http_methods(["GET"])
+def career_analytics(request):
+    """API endpoint with aggregated RIASEC results for admins"""
+    if not request.user.is_administrator:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+
+    try:
+        start = parse_date(request.GET.get('start', '') or '')
+        end = parse_date(request.GET.get('end', '') or '')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid date'}, status=400)
+
+    summary = riasec_summary(start=start, end=end)
+    return JsonResponse({
+        'total': summary['total'],
+        'by_code': summary['by_code'],
+        'by_primary': summary['by_primary'],
+        'by_day': [
+            {'date': item['date'].isoformat(), 'total': item['total']}
+            for item in summary['by_day']
+        ],
+    })
+
+
+@login_required
+@require_http_methods(["POST"])
+def reorder_course_items(request, course_id):
+    """API endpoint to save a drag-and-drop order of course materials, chapters or contents"""
+    try:
+        course = Course.objects.get(id=course_id)
+    except Course.DoesNotExist:
+        return JsonResponse({'error': 'Course not found'}, status=404)
+    if not (request.user.is_administrator or request.user.id in (course.created_by_id, course.instructor_id)):
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+
+    try:
+        payload = json.loads(request.body or '{}')
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+    kind = payload.get('kind')
+    ids = payload.get('ids')
+    if kind not in REORDERABLE or not isinstance(ids, list):
+        return JsonResponse({'error': f"'kind' must be one of {', '.join(REORDERABLE)} and 'ids' a list"}, status=400)
+
+    updated = reorder(kind, course, ids)
+    return JsonResponse({'success': True, 'updated': updated})
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+
+
+def chat_channel(user_id, other_id):
+    low, high = sorted((int(user_id), int(other_id)))
+    return f'chat:{low}:{high}'
+
+
+class LocalBroker:
+    """In-process pub/sub of the newest message id per chat channel
+
+    Only events published in this process are seen, so it suits a single
+    ASGI process; use ``CacheBroker`` (or another shared broker) otherwise.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._waiters = {}
+
+    def latest(self, channel):
+        """Newest message id known for ``channel``, or ``None`` if nothing is known yet"""
+        return self._latest.get(channel)
+
+    def seed(self, channel, message_id):
+        with self._lock:
+            if message_id > self._latest.get(channel, -1):
+                self._latest[channel] = message_id
+
+    async def alatest(self, channel):
+        return self.latest(channel)
+
+    async def aseed(self, channel, message_id):
+        self.seed(channel, message_id)
+
+    def publish(self, channel, message_id):
+        with self._lock:
+            if message_id > self._latest.get(channel, -1):
+                self._latest[channel] = message_id
+            waiters = self._waiters.pop(channel, [])
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(self._wake, future)
+
+    @staticmethod
+    def _wake(future):
+        if not future.done():
+            future.set_result(None)
+
+    async def wait(self, channel, after_id, timeout):
+        """Wait until ``channel`` has a message newer than ``after_id`` or ``timeout`` passes"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            if self._latest.get(channel, -1) > after_id:
+                return
+            self._waiters.setdefault(channel, []).append(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(channel, [])
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters:
+                    self._waiters.pop(channel, None)
+
+
+class CacheBroker:
+    """Channel positions shared through the Django cache; waiters poll the cache, never the database
+
+    Every waiting request reads the cache once per ``poll_interval``, so CACHES
+    must point at Redis or Memcached; DatabaseCache is refused.
+    """
+
+    key_prefix = 'dashboard:chat_events:'
+    poll_interval = 1
+    timeout = 60 * 60
+
+    def __init__(self):
+        if isinstance(caches['default'], DatabaseCache):
+            raise ImproperlyConfigured(
+                'CacheBroker polls the cache every second per waiting request; '
+                'configure CACHES with Redis or Memcached instead of DatabaseCache.'
+            )
+
+    def latest(self, channel):
+        return cache.get(self.key_prefix + channel)
+
+    def seed(self, channel, message_id):
+        cache.add(self.key_prefix + channel, message_id, self.timeout)
+
+    def publish(self, channel, message_id):
+        cache.set(self.key_prefix + channel, message_id, self.timeout)
+
+    async def alatest(self, channel):
+        return await cache.aget(self.key_prefix + channel)
+
+    async def aseed(self, channel, message_id):
+        await cache.aadd(self.key_prefix + channel, message_id, self.timeout)
+
+    async def wait(self, channel, after_id, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            latest = await cache.aget(self.key_prefix + channel)
+            if latest is not None and latest > after_id:
+                return
+            await asyncio.sleep(self.poll_interval)
+
+
+broker = SimpleLazyObject(lambda: import_string(settings.CHAT_EVENT_BROKER)())
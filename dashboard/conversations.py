@@ -0,0 +1,214 @@
+import time
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q
+from django.db.models.functions import Greatest
+
+from core.pagination import encode_cursor, keyset_filter, keyset_page
+from .models import Conversation, Message
+
+
+INBOX_PAGE_SIZE = 50
+CHAT_PAGE_SIZE = 50
+INBOX_SEQUENCE_CACHE_KEY = 'dashboard:inbox_seq:{user_id}'
+INBOX_SEQUENCE_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def _pair(user_id, other_id):
+    return (user_id, other_id) if user_id < other_id else (other_id, user_id)
+
+
+def _unread_field(conversation_low_id, recipient_id):
+    return 'unread_low' if recipient_id == conversation_low_id else 'unread_high'
+
+
+def _get_or_create_conversation(user_id, other_id, last_activity):
+    low, high = _pair(user_id, other_id)
+    try:
+        with transaction.atomic():
+            conversation, _ = Conversation.objects.get_or_create(
+                user_low_id=low,
+                user_high_id=high,
+                defaults={'last_activity': last_activity},
+            )
+    except IntegrityError:
+        conversation = Conversation.objects.get(user_low_id=low, user_high_id=high)
+    return conversation
+
+
+def record_message(message):
+    """Point the pair's conversation at a new message and count it as unread for the recipient"""
+    conversation = _get_or_create_conversation(message.sender_id, message.recipient_id, message.created_at)
+    unread_field = _unread_field(conversation.user_low_id, message.recipient_id)
+    Conversation.objects.filter(pk=conversation.pk).update(
+        last_message=message,
+        last_activity=message.created_at,
+        **{unread_field: F(unread_field) + 1},
+    )
+
+
+def mark_conversation_read(user, other_user):
+    """Mark everything ``other_user`` sent to ``user`` as read and clear the unread counter"""
+    low, high = _pair(user.id, other_user.id)
+    with transaction.atomic():
+        updated = Message.objects.filter(sender=other_user, recipient=user, is_read=False).update(is_read=True)
+        if updated:
+            unread_field = _unread_field(low, user.id)
+            # Subtract rather than zero so a message arriving meanwhile stays counted.
+            Conversation.objects.filter(user_low_id=low, user_high_id=high).update(
+                **{unread_field: Greatest(F(unread_field) - updated, 0)}
+            )
+            # The reader's other tabs poll with this sequence to refresh their unread badges.
+            transaction.on_commit(lambda: bump_inbox_sequence(user.id))
+    return updated
+
+
+def rebuild_conversations(pairs=None, message_model=Message, conversation_model=Conversation):
+    """Recompute conversation rows from ``Message``, optionally only for ``(user_id, other_id)`` pairs
+
+    Migrations pass their historical models. Returns the number of conversations written.
+    """
+    Message, Conversation = message_model, conversation_model
+    messages = Message.objects.all()
+    if pairs is not None:
+        pair_filter = Q(pk__in=[])
+        for user_id, other_id in pairs:
+            pair_filter |= Q(sender_id=user_id, recipient_id=other_id) | Q(sender_id=other_id, recipient_id=user_id)
+        messages = messages.filter(pair_filter)
+    directed = messages.values('sender_id', 'recipient_id').annotate(
+        last_id=Max('id'),
+        unread=Count('id', filter=Q(is_read=False)),
+    )
+    summaries = {}
+    for row in directed:
+        low, high = _pair(row['sender_id'], row['recipient_id'])
+        summary = summaries.setdefault((low, high), {'last_id': 0, 'unread_low': 0, 'unread_high': 0})
+        summary['last_id'] = max(summary['last_id'], row['last_id'])
+        summary[_unread_field(low, row['recipient_id'])] += row['unread']
+    created_at = dict(
+        Message.objects.filter(id__in=[summary['last_id'] for summary in summaries.values()])
+        .values_list('id', 'created_at')
+    )
+    with transaction.atomic():
+        if pairs is None:
+            Conversation.objects.all().delete()
+        else:
+            stale = Q(pk__in=[])
+            for user_id, other_id in pairs:
+                low, high = _pair(user_id, other_id)
+                if (low, high) not in summaries:
+                    stale |= Q(user_low_id=low, user_high_id=high)
+            Conversation.objects.filter(stale).delete()
+        Conversation.objects.bulk_create(
+            [
+                Conversation(
+                    user_low_id=low,
+                    user_high_id=high,
+                    last_message_id=summary['last_id'],
+                    last_activity=created_at[summary['last_id']],
+                    unread_low=summary['unread_low'],
+                    unread_high=summary['unread_high'],
+                )
+                for (low, high), summary in summaries.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['user_low', 'user_high'],
+            update_fields=['last_message', 'last_activity', 'unread_low', 'unread_high'],
+        )
+    return len(summaries)
+
+
+def inbox_page(user, cursor=None, page_size=INBOX_PAGE_SIZE):
+    """One page of ``user``'s conversations, newest activity first
+
+    Returns ``(entries, next_cursor)`` where each entry has the other ``user``,
+    ``last_message``, ``unread_count`` and ``last_message_time``.
+    """
+    conversations = Conversation.objects.filter(Q(user_low=user) | Q(user_high=user)).select_related(
+        'user_low', 'user_high', 'last_message'
+    )
+    page, next_cursor = keyset_page(conversations, 'last_activity', cursor=cursor, page_size=page_size)
+    entries = []
+    for conversation in page:
+        is_low = conversation.user_low_id == user.id
+        entries.append({
+            'user': conversation.user_high if is_low else conversation.user_low,
+            'last_message': conversation.last_message,
+            'unread_count': conversation.unread_low if is_low else conversation.unread_high,
+            'last_message_time': conversation.last_activity,
+        })
+    return entries, next_cursor
+
+
+def chat_history_page(user, other_user, cursor=None, page_size=CHAT_PAGE_SIZE):
+    """One page of the chat between two users, the newest page unless ``cursor`` points further back
+
+    Returns ``(messages, older_cursor)`` with messages oldest first;
+    ``older_cursor`` is ``None`` once the start of the thread is reached.
+    """
+    # Each direction is read newest-first from its own index range, so a page
+    # costs 2 * (page_size + 1) rows however long the thread is.
+    directions = {(user.id, other_user.id), (other_user.id, user.id)}
+    candidates = []
+    for sender_id, recipient_id in directions:
+        messages = Message.objects.filter(sender_id=sender_id, recipient_id=recipient_id)
+        messages = keyset_filter(messages, 'created_at', cursor).select_related('sender', 'recipient')
+        candidates.extend(messages.order_by('-created_at', '-pk')[:page_size + 1])
+    candidates.sort(key=lambda message: (message.created_at, message.pk), reverse=True)
+    page = candidates[:page_size]
+    older_cursor = None
+    if len(candidates) > page_size:
+        oldest = page[-1]
+        older_cursor = encode_cursor(oldest.created_at, oldest.pk)
+    page.reverse()
+    return page, older_cursor
+
+
+def with_date_separators(messages):
+    """Interleave a ``date_separator`` item before the first message of each day"""
+    items = []
+    prev_date = None
+    for message in messages:
+        message_date = message.created_at.date()
+        if message_date != prev_date:
+            items.append({'type': 'date_separator', 'date': message_date})
+        items.append({'type': 'message', 'message': message})
+        prev_date = message_date
+    return items
+
+
+def _inbox_sequence_key(user_id):
+    return INBOX_SEQUENCE_CACHE_KEY.format(user_id=user_id)
+
+
+def _new_sequence():
+    # Clock-based, so the value keeps increasing across cache evictions.
+    return time.time_ns() // 1000
+
+
+def get_inbox_sequence(user_id):
+    """Current inbox sequence for a user, starting a new one if the cache has none"""
+    key = _inbox_sequence_key(user_id)
+    sequence = cache.get(key)
+    if sequence is None:
+        cache.add(key, _new_sequence(), INBOX_SEQUENCE_CACHE_TIMEOUT)
+        sequence = cache.get(key)
+    return sequence
+
+
+def bump_inbox_sequence(*user_ids):
+    """Give each user a new inbox sequence so their next poll does the full lookup"""
+    # A fresh value rather than cache.incr: incr is a read-then-write on the
+    # database cache, so two concurrent bumps could leave the sequence unchanged.
+    cache.set_many(
+        {_inbox_sequence_key(user_id): _new_sequence() for user_id in user_ids},
+        INBOX_SEQUENCE_CACHE_TIMEOUT,
+    )
+
+
+def parse_sequence(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.conversations import rebuild_conversations
+
+
+class Command(BaseCommand):
+    help = "Rebuild the conversation summaries (last message, unread counters) from stored messages."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding conversation summaries...")
+        rows = rebuild_conversations()
+        self.stdout.write(self.style.SUCCESS(f"Conversation summaries rebuilt ({rows} conversations)."))
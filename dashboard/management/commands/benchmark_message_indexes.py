@@ -0,0 +1,130 @@
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from accounts.models import User
+from dashboard.conversations import CHAT_PAGE_SIZE, rebuild_conversations
+from dashboard.models import Conversation, Message, Notification
+
+
+BATCH_SIZE = 10000
+
+
+def uses_index(plan):
+    """True when a query plan reaches its rows through indexes only (PostgreSQL or SQLite)"""
+    lines = [line.strip().lower() for line in plan.splitlines()]
+    if any('seq scan' in line for line in lines):
+        return False
+    # SQLite reports full table scans as a bare "SCAN <table>".
+    if any(re.search(r'\bscan \S+$', line) for line in lines):
+        return False
+    return any('index' in line for line in lines)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large message/notification set in a rolled-back transaction and check that the "
+        "chat, inbox and notification queries are answered from indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=1_000_000, help="Messages to seed.")
+        parser.add_argument("--notifications", type=int, default=200_000, help="Notifications to seed.")
+        parser.add_argument("--users", type=int, default=500, help="Benchmark users to spread rows over.")
+        parser.add_argument("--keep", action="store_true", help="Commit the seeded rows instead of rolling back.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        failures = []
+        with transaction.atomic():
+            users = self._seed_users(options["users"])
+            partners = self._seed_messages(rng, users, options["messages"])
+            self._seed_notifications(rng, users, options["notifications"])
+            self.stdout.write("Building conversation summaries...")
+            rebuild_conversations()
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            user = users[0]
+            other = partners[user.id][0]
+            queries = {
+                "chat window": Message.objects.filter(
+                    Q(sender=user, recipient=other) | Q(sender=other, recipient=user),
+                    id__gt=0,
+                ).order_by("created_at"),
+                "chat history page": Message.objects.filter(sender=user, recipient=other).order_by(
+                    "-created_at", "-pk"
+                )[:CHAT_PAGE_SIZE + 1],
+                "unread badge": Message.objects.filter(recipient=user, is_read=False),
+                "unread from partner": Message.objects.filter(sender=other, recipient=user, is_read=False),
+                "inbox page": Conversation.objects.filter(
+                    Q(user_low=user) | Q(user_high=user)
+                ).order_by("-last_activity", "-pk")[:51],
+                "notifications": Notification.objects.filter(user=user).order_by("-created_at")[:20],
+                "unread notifications": Notification.objects.filter(user=user, is_read=False),
+            }
+            for name, queryset in queries.items():
+                plan = queryset.explain()
+                started = time.perf_counter()
+                rows = len(list(queryset))
+                elapsed = (time.perf_counter() - started) * 1000
+                indexed = uses_index(plan)
+                status = self.style.SUCCESS("index") if indexed else self.style.ERROR("NO INDEX")
+                self.stdout.write(f"{name:<22} {rows:>6} rows {elapsed:>8.2f} ms  {status}")
+                if not indexed:
+                    failures.append(name)
+                    self.stdout.write(plan)
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"Queries without index access: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All benchmarked queries use indexes."))
+
+    def _seed_users(self, count):
+        self.stdout.write(f"Seeding {count} users...")
+        stamp = int(time.time())
+        User.objects.bulk_create(
+            [User(username=f"bench-{stamp}-{index}", role="student") for index in range(count)],
+            batch_size=BATCH_SIZE,
+        )
+        return list(User.objects.filter(username__startswith=f"bench-{stamp}-").order_by("id"))
+
+    def _seed_messages(self, rng, users, count):
+        self.stdout.write(f"Seeding {count} messages...")
+        # Most traffic is between a user and a handful of regular partners.
+        partners = {
+            user.id: rng.sample([candidate for candidate in users if candidate != user], min(8, len(users) - 1))
+            for user in users
+        }
+        for start in range(0, count, BATCH_SIZE):
+            batch = []
+            for _ in range(min(BATCH_SIZE, count - start)):
+                sender = rng.choice(users)
+                recipient = rng.choice(partners[sender.id])
+                batch.append(Message(
+                    sender=sender,
+                    recipient=recipient,
+                    subject="Benchmark",
+                    body="Benchmark message",
+                    is_read=rng.random() < 0.95,
+                ))
+            Message.objects.bulk_create(batch)
+        return partners
+
+    def _seed_notifications(self, rng, users, count):
+        self.stdout.write(f"Seeding {count} notifications...")
+        for start in range(0, count, BATCH_SIZE):
+            Notification.objects.bulk_create([
+                Notification(
+                    user=rng.choice(users),
+                    title="Benchmark",
+                    message="Benchmark notification",
+                    is_read=rng.random() < 0.9,
+                )
+                for _ in range(min(BATCH_SIZE, count - start))
+            ])
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from dashboard.conversations import rebuild_conversations
+
+
+def backfill_conversations(apps, schema_editor):
+    rebuild_conversations(
+        message_model=apps.get_model('dashboard', 'Message'),
+        conversation_model=apps.get_model('dashboard', 'Conversation'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_article_category_article_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_activity', models.DateTimeField()),
+                ('unread_low', models.PositiveIntegerField(default=0, help_text='Unread messages addressed to user_low')),
+                ('unread_high', models.PositiveIntegerField(default=0, help_text='Unread messages addressed to user_high')),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='dashboard.message')),
+                ('user_high', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user_low', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-last_activity'],
+                'indexes': [models.Index(fields=['user_low', '-last_activity', '-id'], name='conversation_low_inbox_idx'), models.Index(fields=['user_high', '-last_activity', '-id'], name='conversation_high_inbox_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user_low', 'user_high'), name='conversation_user_pair_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
@@ -51,6 +51,14 @@ class Message(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Chat windows: both directions of a pair, newer than a message id.
+            models.Index(fields=['sender', 'recipient', 'id'], name='message_pair_idx'),
+            # Chat history pages: one direction of a pair, newest first by (created_at, id).
+            models.Index(fields=['sender', 'recipient', '-created_at', '-id'], name='message_pair_recent_idx'),
+            # Unread badges and mark-as-read updates only ever touch unread rows.
+            models.Index(fields=['recipient', 'sender'], condition=models.Q(is_read=False), name='message_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.sender.username} to {self.recipient.username}: {self.subject}"
@@ -77,6 +85,29 @@ class Message(models.Model):
         return ''
 
 
+class Conversation(models.Model):
+    """Summary of the messages exchanged by one pair of users (``user_low.id < user_high.id``)"""
+    user_low = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    user_high = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    last_message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_activity = models.DateTimeField()
+    unread_low = models.PositiveIntegerField(default=0, help_text="Unread messages addressed to user_low")
+    unread_high = models.PositiveIntegerField(default=0, help_text="Unread messages addressed to user_high")
+
+    class Meta:
+        ordering = ['-last_activity']
+        constraints = [
+            models.UniqueConstraint(fields=['user_low', 'user_high'], name='conversation_user_pair_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['user_low', '-last_activity', '-id'], name='conversation_low_inbox_idx'),
+            models.Index(fields=['user_high', '-last_activity', '-id'], name='conversation_high_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"Conversation {self.user_low_id} <-> {self.user_high_id}"
+
+
 class Notification(models.Model):
     """System notifications for users"""
     NOTIFICATION_TYPES = [
@@ -99,6 +130,10 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_user_recent_idx'),
+            models.Index(fields=['user'], condition=models.Q(is_read=False), name='notification_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username}: {self.title}"
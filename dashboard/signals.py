@@ -0,0 +1,24 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .chat_events import broker, chat_channel
+from .conversations import bump_inbox_sequence, rebuild_conversations, record_message
+from .models import Message
+
+
+@receiver(post_save, sender=Message)
+def message_saved(sender, instance, created, **kwargs):
+    if created:
+        record_message(instance)
+        channel = chat_channel(instance.sender_id, instance.recipient_id)
+        transaction.on_commit(lambda: broker.publish(channel, instance.id))
+        transaction.on_commit(lambda: bump_inbox_sequence(instance.recipient_id, instance.sender_id))
+    else:
+        # Edits (e.g. toggling is_read in the admin) resync the pair's summary.
+        rebuild_conversations(pairs=[(instance.sender_id, instance.recipient_id)])
+
+
+@receiver(post_delete, sender=Message)
+def message_deleted(sender, instance, **kwargs):
+    rebuild_conversations(pairs=[(instance.sender_id, instance.recipient_id)])
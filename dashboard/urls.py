@@ -69,6 +69,7 @@ urlpatterns = [
     path('admin/courses/certificates/<int:certificate_id>/edit/', views.admin_certificate_edit, name='admin_course_certificate_edit'),
     path('admin/courses/certificates/<int:certificate_id>/delete/', views.admin_certificate_delete, name='admin_course_certificate_delete'),
     path('admin/reports/', views.admin_reports, name='admin_reports'),
+    path('admin/reports/career-discovery/', views.admin_career_analytics, name='admin_career_analytics'),
     path('profile/', views.profile, name='profile'),
     
     # CV Builder
@@ -108,6 +109,10 @@ urlpatterns = [
     
     # Chat API endpoints for real-time updates
     path('api/chat/<int:user_id>/messages/', api_views.get_chat_messages, name='api_chat_messages'),
+    path('api/chat/<int:user_id>/history/', api_views.get_chat_history, name='api_chat_history'),
+    path('api/chat/<int:user_id>/events/', api_views.chat_events, name='api_chat_events'),
     path('api/chat/<int:user_id>/send/', api_views.send_message_api, name='api_send_message'),
     path('api/conversations/', api_views.get_conversations, name='api_conversations'),
+    path('api/career-analytics/', api_views.career_analytics, name='api_career_analytics'),
+    path('api/courses/<int:course_id>/reorder/', api_views.reorder_course_items, name='api_course_reorder'),
 ]
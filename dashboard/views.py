@@ -1,9 +1,10 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.utils.text import slugify
-from django.db.models import Count
 from django.forms import HiddenInput
 from .models import StudentCV, Message, Notification, Article, Event
 from .forms import (
@@ -30,8 +31,12 @@ from opportunities.models import Application, Opportunity
 from accounts.models import User
 from mentorship.models import MentorshipConnection
 from training.models import Enrollment, Course, CourseMaterial, Certificate
+from training.ordering import reorder
+from core.pagination import decode_cursor
+from .conversations import chat_history_page, inbox_page, mark_conversation_read, with_date_separators
 from careers.models import Career
 from careers.models import CareerDiscoveryResponse
+from careers.analytics import riasec_summary
 
 
 @login_required
@@ -919,6 +924,27 @@ def admin_reports(request):
     return render(request, 'dashboard/admin_reports.html', context)
 
 
+@login_required
+def admin_career_analytics(request):
+    if not request.user.is_administrator:
+        return redirect('dashboard:index')
+
+    try:
+        start = parse_date(request.GET.get('start', '') or '')
+        end = parse_date(request.GET.get('end', '') or '')
+    except ValueError:
+        start = end = None
+    summary = riasec_summary(start=start, end=end)
+    context = {
+        'page_title': 'Career Discovery Analytics',
+        'summary': summary,
+        'top_codes': summary['by_code'][:20],
+        'start': start,
+        'end': end,
+    }
+    return render(request, 'dashboard/admin_career_analytics.html', context)
+
+
 def _generate_unique_slug(model, base_slug):
     slug = base_slug
     counter = 1
@@ -1104,12 +1130,6 @@ def courses_list(request):
 
     courses = (
         Course.objects.filter(created_by=request.user)
-        .annotate(
-            chapter_count=Count('chapters', distinct=True),
-            quiz_count=Count('quizzes', distinct=True),
-            enrollment_count=Count('enrollments', distinct=True),
-            materials_count=Count('materials', distinct=True),
-        )
         .order_by('-created_at')
     )
     total_courses = courses.count()
@@ -1202,10 +1222,7 @@ def course_manage(request, course_id):
             messages.info(request, 'Course material deleted.')
             return redirect('dashboard:course_manage', course_id=course.id)
         elif action == 'reorder_materials':
-            order_list = request.POST.get('material_order', '')
-            ids = [int(item) for item in order_list.split(',') if item.isdigit()]
-            for index, material_id in enumerate(ids, start=1):
-                CourseMaterial.objects.filter(id=material_id, course=course).update(order=index)
+            reorder('materials', course, request.POST.get('material_order', '').split(','))
             messages.success(request, 'Material order updated.')
             return redirect('dashboard:course_manage', course_id=course.id)
         elif action == 'save_enrollment':
@@ -1354,55 +1371,7 @@ def partner_student_create(request):
 @login_required
 def messages_list(request):
     """WhatsApp-style chat conversations list"""
-    from django.db.models import Q, Max
-    from accounts.models import User
-    
-    # Get all unique users you've conversed with
-    conversations_query = Message.objects.filter(
-        Q(sender=request.user) | Q(recipient=request.user)
-    ).values('sender', 'recipient').annotate(
-        last_message_time=Max('created_at')
-    ).order_by('-last_message_time')
-    
-    conversations = []
-    seen_users = set()
-    
-    for conv in conversations_query:
-        # Get the other user in the conversation
-        if conv['sender'] == request.user.id:
-            other_user_id = conv['recipient']
-        else:
-            other_user_id = conv['sender']
-        
-        # Avoid duplicates
-        if other_user_id not in seen_users:
-            seen_users.add(other_user_id)
-            try:
-                other_user = User.objects.get(id=other_user_id)
-                # Get last message
-                last_message = Message.objects.filter(
-                    Q(sender=request.user, recipient=other_user) |
-                    Q(sender=other_user, recipient=request.user)
-                ).order_by('-created_at').first()
-                
-                # Count unread messages from this user
-                unread = Message.objects.filter(
-                    sender=other_user,
-                    recipient=request.user,
-                    is_read=False
-                ).count()
-                
-                conversations.append({
-                    'user': other_user,
-                    'last_message': last_message,
-                    'unread_count': unread,
-                    'last_message_time': conv['last_message_time'],
-                })
-            except User.DoesNotExist:
-                continue
-    
-    # Sort by last message time
-    conversations.sort(key=lambda x: x['last_message_time'], reverse=True)
+    conversations, next_cursor = inbox_page(request.user, cursor=decode_cursor(request.GET.get('before')))
     
     unread_count = Message.objects.filter(recipient=request.user, is_read=False).count()
     
@@ -1415,6 +1384,7 @@ def messages_list(request):
     context = {
         'page_title': 'Chats',
         'conversations': conversations,
+        'next_cursor': next_cursor,
         'unread_count': unread_count,
     }
     return render(request, template, context)
@@ -1492,38 +1462,15 @@ def message_detail(request, message_id):
 def chat_detail(request, user_id):
     """WhatsApp-style chat conversation with a specific user"""
     from accounts.models import User
-    from django.db.models import Q, Max
     
     other_user = get_object_or_404(User, id=user_id)
     
-    # Get all messages in this conversation
-    chat_messages_list = list(Message.objects.filter(
-        Q(sender=request.user, recipient=other_user) |
-        Q(sender=other_user, recipient=request.user)
-    ).select_related('sender', 'recipient').order_by('created_at'))
-    
-    # Add date separators to messages
-    chat_messages = []
-    prev_date = None
-    for msg in chat_messages_list:
-        msg_date = msg.created_at.date()
-        if prev_date is None or prev_date != msg_date:
-            chat_messages.append({
-                'type': 'date_separator',
-                'date': msg.created_at.date(),
-            })
-        chat_messages.append({
-            'type': 'message',
-            'message': msg,
-        })
-        prev_date = msg_date
+    # Latest page only; older pages are fetched from api_chat_history
+    page, older_cursor = chat_history_page(request.user, other_user)
+    chat_messages = with_date_separators(page)
     
     # Mark all unread messages from this user as read
-    Message.objects.filter(
-        sender=other_user,
-        recipient=request.user,
-        is_read=False
-    ).update(is_read=True)
+    mark_conversation_read(request.user, other_user)
     
     # Handle sending new message
     if request.method == 'POST':
@@ -1548,46 +1495,7 @@ def chat_detail(request, user_id):
             return redirect('dashboard:chat_detail', user_id=user_id)
     
     # Get conversations list for sidebar
-    conversations_query = Message.objects.filter(
-        Q(sender=request.user) | Q(recipient=request.user)
-    ).values('sender', 'recipient').annotate(
-        last_message_time=Max('created_at')
-    ).order_by('-last_message_time')
-    
-    conversations = []
-    seen_users = set()
-    
-    for conv in conversations_query:
-        if conv['sender'] == request.user.id:
-            other_user_id = conv['recipient']
-        else:
-            other_user_id = conv['sender']
-        
-        if other_user_id not in seen_users:
-            seen_users.add(other_user_id)
-            try:
-                conv_user = User.objects.get(id=other_user_id)
-                last_message = Message.objects.filter(
-                    Q(sender=request.user, recipient=conv_user) |
-                    Q(sender=conv_user, recipient=request.user)
-                ).order_by('-created_at').first()
-                
-                unread = Message.objects.filter(
-                    sender=conv_user,
-                    recipient=request.user,
-                    is_read=False
-                ).count()
-                
-                conversations.append({
-                    'user': conv_user,
-                    'last_message': last_message,
-                    'unread_count': unread,
-                    'last_message_time': conv['last_message_time'],
-                })
-            except User.DoesNotExist:
-                continue
-    
-    conversations.sort(key=lambda x: x['last_message_time'], reverse=True)
+    conversations, _ = inbox_page(request.user)
     
     # Choose template based on user role
     if request.user.is_mentor:
@@ -1599,7 +1507,9 @@ def chat_detail(request, user_id):
         'page_title': f'Chat with {other_user.get_full_name() or other_user.username}',
         'other_user': other_user,
         'chat_messages': chat_messages,
+        'older_cursor': older_cursor,
         'conversations': conversations,
+        'chat_long_poll': settings.CHAT_LONG_POLL,
     }
     return render(request, template, context)
 
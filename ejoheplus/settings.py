@@ -191,6 +191,29 @@ AUTHENTICATION_BACKENDS = (
     'allauth.account.auth_backends.AuthenticationBackend',
 )
 
+# Cache. Version stamps, cached indexes and chat sequences must be shared by
+# every gunicorn worker, so the default is the database cache rather than the
+# per-process LocMemCache (run `python manage.py createcachetable` once).
+# Point DJANGO_CACHE_BACKEND/DJANGO_CACHE_LOCATION at Redis or Memcached to scale further.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get("DJANGO_CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"),
+        'LOCATION': os.environ.get("DJANGO_CACHE_LOCATION", "ejoheplus_cache"),
+    }
+}
+if CACHES['default']['BACKEND'] == "django.core.cache.backends.db.DatabaseCache":
+    # The default cap of 300 rows would keep culling version stamps and sequences.
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': 50000}
+
+# Chat delivery. Long polling holds requests open, so enable it only when
+# serving ejoheplus.asgi:application (e.g. gunicorn -k uvicorn.workers.UvicornWorker).
+# LocalBroker only sees messages sent through the same process; with several
+# processes use dashboard.chat_events.CacheBroker, which goes through CACHES above
+# and needs Redis or Memcached there (it refuses DatabaseCache).
+CHAT_LONG_POLL = get_env_bool("CHAT_LONG_POLL", default=False)
+CHAT_LONG_POLL_TIMEOUT = 25
+CHAT_EVENT_BROKER = os.environ.get("CHAT_EVENT_BROKER", "dashboard.chat_events.LocalBroker")
+
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
@@ -4,7 +4,8 @@ from django.contrib import messages
 from django.utils import timezone
 from accounts.models import User
 from training.models import Course
-from careers.models import CareerDiscoveryResponse, CareerOptionWeight, Career
+from careers.models import CareerDiscoveryResponse, Career
+from careers.scoring import top_weighted_careers
 from django.db.models import Prefetch
 from dashboard.models import Notification
 from .models import MentorshipConnection, MentorshipSession, MentorResource, MentorProfile
@@ -42,11 +43,8 @@ def mentor_list(request):
         if session_key:
             latest_response = CareerDiscoveryResponse.objects.filter(session_key=session_key).order_by('-created_at').first()
             if latest_response:
-                weights = CareerOptionWeight.objects.filter(option__careerdiscoveryanswer__response=latest_response).select_related('career')
-                scores = {}
-                for weight in weights:
-                    scores[weight.career_id] = scores.get(weight.career_id, 0) + weight.weight
-                top_career_ids = sorted(scores, key=scores.get, reverse=True)[:5]
+                option_ids = latest_response.answers.values_list('option_id', flat=True)
+                top_career_ids = top_weighted_careers(option_ids, limit=5)
                 recommended = mentors.filter(
                     mentor_profile__career_focuses__id__in=top_career_ids
                 ).distinct()[:6]
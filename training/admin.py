@@ -1,4 +1,5 @@
 from django.contrib import admin
+from .certificates import issue_due_certificates, queue_certificate_pdf
 from .models import (
     Course,
     CourseMaterial,
@@ -19,6 +20,18 @@ class CourseAdmin(admin.ModelAdmin):
     list_filter = ['level', 'is_free', 'is_active']
     prepopulated_fields = {'slug': ('title',)}
     search_fields = ['title', 'description']
+    actions = ['issue_certificates']
+
+    @admin.action(description='Issue due certificates')
+    def issue_certificates(self, request, queryset):
+        issued = 0
+        for course in queryset:
+            certificate_ids = issue_due_certificates(course)
+            # PDFs go to the background renderer; the issue_course_certificates command renders them in a process pool.
+            for certificate_id in certificate_ids:
+                queue_certificate_pdf(certificate_id)
+            issued += len(certificate_ids)
+        self.message_user(request, f'Issued {issued} certificates; PDFs are rendering in the background.')
 
 
 @admin.register(CourseMaterial)
@@ -1,12 +1,22 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, quote_etag
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from core.pagination import KeysetPagination
 from .models import Course
 from .serializers import CourseSerializer
 
 
 class CourseViewSet(viewsets.ModelViewSet):
     serializer_class = CourseSerializer
-    queryset = Course.objects.all().order_by('-created_at')
+    queryset = Course.objects.select_related('instructor')
+    pagination_class = KeysetPagination
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -15,15 +25,61 @@ class CourseViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        limit = self.request.query_params.get('limit')
-        if limit:
+        if self.action != 'list':
+            return queryset
+        params = self.request.query_params
+        for field in ['category', 'level']:
+            if params.get(field):
+                queryset = queryset.filter(**{field: params[field]})
+        is_free = params.get('is_free', '').lower()
+        if is_free in ['true', '1']:
+            queryset = queryset.filter(is_free=True)
+        elif is_free in ['false', '0']:
+            queryset = queryset.filter(is_free=False)
+        elif is_free:
+            raise ValidationError({'is_free': ['Must be one of true, false, 1 or 0.']})
+        if params.get('updated_since'):
             try:
-                limit_val = max(1, min(int(limit), 100))
-                queryset = queryset[:limit_val]
+                updated_since = parse_datetime(params['updated_since'])
             except ValueError:
-                pass
+                updated_since = None
+            if updated_since is None:
+                raise ValidationError({'updated_since': ['Must be an ISO 8601 datetime.']})
+            queryset = queryset.filter(updated_at__gt=updated_since)
         return queryset
 
+    def _conditional(self, request, etag_source, last_modified, respond):
+        """Answer 304 when the client's ETag/Last-Modified still match, else build the response"""
+        etag = quote_etag(hashlib.md5(etag_source.encode()).hexdigest())
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = respond()
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.aggregate(total=Count('id'), last_modified=Max('updated_at'))
+        etag_source = f"{request.get_full_path()}|{stats['total']}|{stats['last_modified']}"
+        return self._conditional(
+            request,
+            etag_source,
+            stats['last_modified'],
+            lambda: super(CourseViewSet, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        course = self.get_object()
+        return self._conditional(
+            request,
+            f'{course.pk}|{course.updated_at}',
+            course.updated_at,
+            lambda: Response(self.get_serializer(course).data),
+        )
+
     def perform_create(self, serializer):
         instructor = self.request.user if self.request.user.role == 'mentor' else None
         serializer.save(created_by=self.request.user, instructor=instructor)
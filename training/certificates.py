@@ -0,0 +1,201 @@
+import hashlib
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Q
+from django.template.loader import get_template
+from django.utils import timezone
+from xhtml2pdf import pisa
+
+from .models import Certificate, Enrollment
+from .progress import invalidate_learning_progress
+
+
+logger = logging.getLogger(__name__)
+
+CERTIFICATE_TEMPLATE = 'training/certificate_pdf.html'
+CERTIFICATE_QUEUED_CACHE_KEY = 'training:certificate_pdf_queued:{certificate_id}'
+# A render that failed or died with its worker is queued again after this long.
+CERTIFICATE_REQUEUE_AFTER = 60
+
+# Renders run off the request path; swap this for a task queue worker if one is added.
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'CERTIFICATE_PDF_WORKERS', 2),
+    thread_name_prefix='certificate-pdf',
+)
+
+
+class CertificateRenderError(Exception):
+    pass
+
+
+def certificate_pdf_ready(certificate):
+    return bool(certificate.pdf_file) and certificate.pdf_file.storage.exists(certificate.pdf_file.name)
+
+
+def issue_certificate(enrollment):
+    """Create the enrollment's certificate if needed, queueing a render while its PDF is missing"""
+    certificate, created = Certificate.objects.get_or_create(
+        enrollment=enrollment,
+        defaults={'certificate_id': f"CERT-{enrollment.id}-{timezone.now().strftime('%Y%m%d')}"}
+    )
+    # New certificates are queued by post_save; older ones may have lost their render.
+    if not created and not certificate_pdf_ready(certificate):
+        queue_certificate_pdf(certificate.id, force=bool(certificate.pdf_file))
+    return certificate
+
+
+def render_certificate_html(certificate):
+    enrollment = certificate.enrollment
+    return get_template(CERTIFICATE_TEMPLATE).render({
+        'course': enrollment.course,
+        'enrollment': enrollment,
+        'certificate': certificate,
+    })
+
+
+def render_certificate_pdf(html):
+    result = BytesIO()
+    pdf = pisa.pisaDocument(BytesIO(html.encode('UTF-8')), result)
+    if pdf.err:
+        raise CertificateRenderError('Unable to generate certificate PDF.')
+    return result.getvalue()
+
+
+def generate_certificate_pdf(certificate_id, force=False):
+    """Render and store a certificate PDF, keyed by a hash of its rendered HTML
+
+    Returns ``True`` when a new file was written. Certificates whose HTML is
+    unchanged keep their stored file unless ``force`` is set.
+    """
+    certificate = Certificate.objects.select_related(
+        'enrollment__course', 'enrollment__student'
+    ).filter(pk=certificate_id).first()
+    if certificate is None:
+        return False
+    html = render_certificate_html(certificate)
+    content_hash = hashlib.sha256(html.encode('UTF-8')).hexdigest()
+    if not force and certificate.pdf_file and certificate.pdf_hash == content_hash:
+        return False
+
+    old_name = certificate.pdf_file.name
+    storage = certificate.pdf_file.storage
+    name = storage.save(
+        certificate.pdf_file.field.generate_filename(
+            certificate, f'{certificate.certificate_id}-{content_hash[:12]}.pdf'
+        ),
+        ContentFile(render_certificate_pdf(html)),
+    )
+    # A queryset update skips post_save, so storing the file never requeues a render.
+    Certificate.objects.filter(pk=certificate.pk).update(
+        pdf_file=name,
+        pdf_hash=content_hash,
+        pdf_generated_at=timezone.now(),
+    )
+    if old_name and old_name != name:
+        storage.delete(old_name)
+    return True
+
+
+def _run_generate(certificate_id, force):
+    try:
+        generate_certificate_pdf(certificate_id, force=force)
+    except Exception:
+        logger.exception('Certificate PDF render failed for certificate %s', certificate_id)
+    finally:
+        cache.delete(CERTIFICATE_QUEUED_CACHE_KEY.format(certificate_id=certificate_id))
+        close_old_connections()
+
+
+def queue_certificate_pdf(certificate_id, force=False):
+    """Render a certificate PDF in the background once the current transaction commits
+
+    Requests while a render is already queued are ignored; the marker expires
+    so a render lost with its process is retried by the next request.
+    """
+    key = CERTIFICATE_QUEUED_CACHE_KEY.format(certificate_id=certificate_id)
+    if cache.add(key, True, CERTIFICATE_REQUEUE_AFTER):
+        transaction.on_commit(lambda: _executor.submit(_run_generate, certificate_id, force))
+
+
+def due_enrollments(course):
+    """Enrollments of ``course`` that have finished it but hold no certificate yet
+
+    A course without chapters or quizzes has nothing to finish, so only
+    enrollments already marked completed are due.
+    """
+    finished = Q(is_completed=True)
+    if course.chapter_count or course.quiz_count:
+        finished |= Q(completed_chapter_count__gte=course.chapter_count, passed_quiz_count__gte=course.quiz_count)
+    return Enrollment.objects.filter(course=course, certificate__isnull=True).filter(finished)
+
+
+def issue_due_certificates(course):
+    """Complete and certify every due enrollment of ``course`` in bulk
+
+    Returns the ids of the new certificates. ``bulk_create`` skips post_save,
+    so rendering their PDFs is left to the caller.
+    """
+    now = timezone.now()
+    stamp = now.strftime('%Y%m%d')
+    with transaction.atomic():
+        enrollment_ids = list(due_enrollments(course).select_for_update(of=('self',)).values_list('id', flat=True))
+        if not enrollment_ids:
+            return []
+        Enrollment.objects.filter(id__in=enrollment_ids, is_completed=False).update(
+            is_completed=True,
+            completed_at=now,
+        )
+        invalidate_learning_progress(
+            *Enrollment.objects.filter(id__in=enrollment_ids).values_list('student_id', flat=True)
+        )
+        Certificate.objects.bulk_create(
+            [
+                Certificate(enrollment_id=enrollment_id, certificate_id=f'CERT-{enrollment_id}-{stamp}')
+                for enrollment_id in enrollment_ids
+            ],
+            ignore_conflicts=True,
+        )
+        return list(
+            Certificate.objects.filter(enrollment_id__in=enrollment_ids, pdf_file='').values_list('id', flat=True)
+        )
+
+
+def _init_render_worker():
+    django.setup()
+
+
+def _render_in_worker(certificate_id):
+    try:
+        return certificate_id, generate_certificate_pdf(certificate_id), None
+    except CertificateRenderError as exc:
+        return certificate_id, False, str(exc)
+    finally:
+        close_old_connections()
+
+
+def render_certificates(certificate_ids, workers=None):
+    """Render certificate PDFs in a process pool
+
+    Returns ``(written, failed_ids, elapsed_seconds)``.
+    """
+    workers = workers or getattr(settings, 'CERTIFICATE_RENDER_PROCESSES', 4)
+    started = time.monotonic()
+    written, failed_ids = 0, []
+    if certificate_ids:
+        # Forked workers must not inherit open database connections.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as pool:
+            for certificate_id, was_written, error in pool.map(_render_in_worker, certificate_ids):
+                if error:
+                    failed_ids.append(certificate_id)
+                elif was_written:
+                    written += 1
+    return written, failed_ids, time.monotonic() - started
@@ -0,0 +1,38 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import ChapterContent, Course, CourseChapter, CourseMaterial, Enrollment, Quiz
+
+
+def _count_for_course(model, course_field='course'):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{course_field: OuterRef('pk')})
+            .values(course_field)
+            .annotate(total=Count('id'))
+            .values('total')
+        ),
+        0,
+    )
+
+
+def recompute_course_counts(courses=None):
+    """Rebuild the denormalised course counters from their source rows, returning rows updated"""
+    if courses is None:
+        courses = Course.objects.all()
+    return courses.update(
+        lesson_count=_count_for_course(ChapterContent, 'chapter__course'),
+        chapter_count=_count_for_course(CourseChapter),
+        quiz_count=_count_for_course(Quiz),
+        materials_count=_count_for_course(CourseMaterial),
+        enrollment_count=_count_for_course(Enrollment),
+    )
+
+
+def refresh_course_counts(course_id):
+    if course_id is not None:
+        recompute_course_counts(Course.objects.filter(pk=course_id))
+
+
+def adjust_enrollment_count(course_id, delta):
+    Course.objects.filter(pk=course_id).update(enrollment_count=F('enrollment_count') + delta)
@@ -29,4 +29,6 @@ urlpatterns = [
     path('chapters/<int:chapter_id>/complete/', views.mark_chapter_complete, name='chapter_complete'),
     path('quizzes/<int:quiz_id>/take/', views.take_quiz, name='take_quiz'),
     path('<slug:slug>/certificate/', views.download_certificate, name='download_certificate'),
+    path('contents/<int:content_id>/file/', views.content_file, name='content_file'),
+    path('materials/<int:material_id>/file/', views.material_file, name='material_file'),
 ]
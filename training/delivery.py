@@ -0,0 +1,97 @@
+import hashlib
+import mimetypes
+import os
+import re
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+
+CHUNK_SIZE = 64 * 1024
+CACHE_CONTROL = 'private, max-age=86400'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def file_etag(field_file, size):
+    """Strong ETag for a stored file; storage never reuses a name for new content"""
+    return quote_etag(hashlib.md5(f'{field_file.name}:{size}'.encode()).hexdigest())
+
+
+def parse_range(header, size):
+    """Return ``(start, end)`` for a single ``bytes=`` range, ``None`` to serve the whole file
+
+    Raises ``ValueError`` when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        # Absent, malformed or multi-range requests fall back to a full 200 response.
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        # An end before the start makes the header invalid, so it is ignored.
+        return None
+    if start >= size:
+        raise ValueError('Range not satisfiable')
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _iter_range(handle, start, length):
+    try:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+def serve_file(request, field_file, filename=None, as_attachment=False):
+    """Stream a stored file with conditional GET and single byte-range support"""
+    size = field_file.size
+    etag = file_etag(field_file, size)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    filename = filename or os.path.basename(field_file.name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if not if_range or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            response['Accept-Ranges'] = 'bytes'
+            return response
+
+    handle = field_file.storage.open(field_file.name, 'rb')
+    if byte_range is None:
+        response = FileResponse(handle, content_type=content_type, as_attachment=as_attachment, filename=filename)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_iter_range(handle, start, length), status=206, content_type=content_type)
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        disposition = 'attachment' if as_attachment else 'inline'
+        response['Content-Disposition'] = f'{disposition}; filename="{filename}"'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Cache-Control'] = CACHE_CONTROL
+    return response
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+
+from .models import Question
+
+
+ANSWER_KEY_CACHE_KEY = 'training:quiz_answer_key:{quiz_id}'
+ANSWER_KEY_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def build_answer_key(quiz_id):
+    """Map every question of a quiz to the set of its correct choice ids"""
+    answer_key = {}
+    rows = Question.objects.filter(quiz_id=quiz_id).values_list('id', 'choices__id', 'choices__is_correct')
+    for question_id, choice_id, is_correct in rows:
+        correct = answer_key.setdefault(question_id, set())
+        if choice_id is not None and is_correct:
+            correct.add(choice_id)
+    return {question_id: frozenset(correct) for question_id, correct in answer_key.items()}
+
+
+def get_answer_key(quiz_id):
+    cache_key = ANSWER_KEY_CACHE_KEY.format(quiz_id=quiz_id)
+    answer_key = cache.get(cache_key)
+    if answer_key is None:
+        answer_key = build_answer_key(quiz_id)
+        cache.set(cache_key, answer_key, ANSWER_KEY_CACHE_TIMEOUT)
+    return answer_key
+
+
+def invalidate_answer_key(quiz_id):
+    cache.delete(ANSWER_KEY_CACHE_KEY.format(quiz_id=quiz_id))
+
+
+def grade_submission(answer_key, data):
+    """Percentage of questions answered with a correct choice, from ``question_<id>`` fields"""
+    total = len(answer_key)
+    if not total:
+        return 0
+    correct = 0
+    for question_id, correct_choice_ids in answer_key.items():
+        answer = data.get(f'question_{question_id}')
+        if not answer:
+            continue
+        try:
+            choice_id = int(answer)
+        except (TypeError, ValueError):
+            continue
+        if choice_id in correct_choice_ids:
+            correct += 1
+    return int((correct / total) * 100)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from training.certificates import issue_due_certificates, render_certificates
+from training.models import Course
+
+
+class Command(BaseCommand):
+    help = "Issue certificates for every enrollment that has completed a course and render their PDFs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("course", help="Slug of the course to certify.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Number of PDF render processes (defaults to CERTIFICATE_RENDER_PROCESSES or 4).",
+        )
+
+    def handle(self, *args, **options):
+        course = Course.objects.filter(slug=options["course"]).first()
+        if course is None:
+            raise CommandError(f"No course with slug '{options['course']}'.")
+        certificate_ids = issue_due_certificates(course)
+        self.stdout.write(f"Issued {len(certificate_ids)} certificates for {course.title}.")
+        written, failed_ids, elapsed = render_certificates(certificate_ids, workers=options["workers"])
+        rate = written / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(f"Rendered {written} PDFs in {elapsed:.1f}s ({rate:.1f}/s).")
+        )
+        if failed_ids:
+            self.stderr.write(f"Failed to render certificates: {', '.join(map(str, failed_ids))}")
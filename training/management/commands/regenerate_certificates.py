@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from training.certificates import CertificateRenderError, generate_certificate_pdf
+from training.models import Certificate
+
+
+class Command(BaseCommand):
+    help = "Re-render stored certificate PDFs, e.g. after a certificate template change."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            help="Only regenerate certificates of the course with this slug.",
+        )
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only render certificates that have no stored PDF yet.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render even when the certificate content hash is unchanged.",
+        )
+
+    def handle(self, *args, **options):
+        certificates = Certificate.objects.order_by("id")
+        if options["course"]:
+            certificates = certificates.filter(enrollment__course__slug=options["course"])
+        if options["missing"]:
+            certificates = certificates.filter(pdf_file="")
+        written = failed = 0
+        for certificate_id in certificates.values_list("id", flat=True).iterator():
+            try:
+                if generate_certificate_pdf(certificate_id, force=options["force"]):
+                    written += 1
+            except CertificateRenderError:
+                failed += 1
+                self.stderr.write(f"Could not render certificate {certificate_id}.")
+        self.stdout.write(self.style.SUCCESS(f"Regenerated {written} certificate PDFs ({failed} failed)."))
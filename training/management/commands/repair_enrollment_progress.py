@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from training.models import Enrollment
+from training.progress import recompute_progress_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute enrollment chapter and quiz counters from progress and attempt records."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            help="Only repair enrollments of the course with this slug.",
+        )
+
+    def handle(self, *args, **options):
+        enrollments = Enrollment.objects.all()
+        if options["course"]:
+            enrollments = enrollments.filter(course__slug=options["course"])
+        updated = recompute_progress_counters(enrollments)
+        self.stdout.write(self.style.SUCCESS(f"Repaired progress counters for {updated} enrollments."))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_progress_counters(apps, schema_editor):
+    Enrollment = apps.get_model('training', 'Enrollment')
+    ChapterProgress = apps.get_model('training', 'ChapterProgress')
+    QuizAttempt = apps.get_model('training', 'QuizAttempt')
+    completed_chapters = (
+        ChapterProgress.objects.filter(enrollment=OuterRef('pk'), is_completed=True)
+        .values('enrollment')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    passed_quizzes = (
+        QuizAttempt.objects.filter(enrollment=OuterRef('pk'), passed=True)
+        .values('enrollment')
+        .annotate(total=Count('quiz', distinct=True))
+        .values('total')
+    )
+    Enrollment.objects.update(
+        completed_chapter_count=Coalesce(Subquery(completed_chapters), 0),
+        passed_quiz_count=Coalesce(Subquery(passed_quizzes), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0005_alter_course_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_chapter_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='passed_quiz_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Distinct quizzes with a passing attempt'),
+        ),
+        migrations.RunPython(backfill_progress_counters, migrations.RunPython.noop),
+    ]
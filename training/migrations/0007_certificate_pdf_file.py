@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0006_enrollment_progress_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='pdf_file',
+            field=models.FileField(blank=True, upload_to='certificates/'),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='pdf_generated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='pdf_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:19
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_course_counters(apps, schema_editor):
+    Course = apps.get_model('training', 'Course')
+
+    def count_for_course(model_name, course_field='course'):
+        model = apps.get_model('training', model_name)
+        return Coalesce(
+            Subquery(
+                model.objects.filter(**{course_field: OuterRef('pk')})
+                .values(course_field)
+                .annotate(total=Count('id'))
+                .values('total')
+            ),
+            0,
+        )
+
+    Course.objects.update(
+        lesson_count=count_for_course('ChapterContent', 'chapter__course'),
+        chapter_count=count_for_course('CourseChapter'),
+        quiz_count=count_for_course('Quiz'),
+        materials_count=count_for_course('CourseMaterial'),
+        enrollment_count=count_for_course('Enrollment'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0007_certificate_pdf_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='chapter_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='enrollment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='lesson_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='materials_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='quiz_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_course_counters, migrations.RunPython.noop),
+    ]
@@ -26,14 +26,39 @@ class Course(models.Model):
     is_free = models.BooleanField(default=True)
     thumbnail = models.ImageField(upload_to='courses/', blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    lesson_count = models.PositiveIntegerField(default=0, editable=False)
+    chapter_count = models.PositiveIntegerField(default=0, editable=False)
+    quiz_count = models.PositiveIntegerField(default=0, editable=False)
+    materials_count = models.PositiveIntegerField(default=0, editable=False)
+    enrollment_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='course_catalog_idx'),
+            models.Index(fields=['category', '-created_at', '-id'], name='course_category_idx'),
+            models.Index(fields=['level', '-created_at', '-id'], name='course_level_idx'),
+            models.Index(fields=['is_free', '-created_at', '-id'], name='course_is_free_idx'),
+            models.Index(fields=['updated_at'], name='course_updated_idx'),
+        ]
+    
+    # Maintained by queryset updates in training.course_counts.
+    COUNTER_FIELDS = ('lesson_count', 'chapter_count', 'quiz_count', 'materials_count', 'enrollment_count')
     
     def __str__(self):
         return self.title
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            # A copy loaded earlier (edit forms, the admin) would write stale counters back.
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
 
 class CourseChapter(models.Model):
@@ -103,6 +128,8 @@ class Enrollment(models.Model):
     enrolled_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     is_completed = models.BooleanField(default=False)
+    completed_chapter_count = models.PositiveIntegerField(default=0, editable=False)
+    passed_quiz_count = models.PositiveIntegerField(default=0, editable=False, help_text="Distinct quizzes with a passing attempt")
     
     class Meta:
         unique_together = ['course', 'student']
@@ -182,6 +209,9 @@ class Certificate(models.Model):
     enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, related_name='certificate')
     issued_at = models.DateTimeField(auto_now_add=True)
     certificate_id = models.CharField(max_length=50, unique=True)
+    pdf_file = models.FileField(upload_to='certificates/', blank=True)
+    pdf_hash = models.CharField(max_length=64, blank=True)
+    pdf_generated_at = models.DateTimeField(null=True, blank=True)
     
     def __str__(self):
         return f"Certificate for {self.enrollment.student.username} - {self.enrollment.course.title}"
@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+
+from .models import ChapterContent, CourseChapter, CourseMaterial
+from .outline import invalidate_course_outline
+
+
+# kind -> (model, lookup from the model to its course)
+REORDERABLE = {
+    'materials': (CourseMaterial, 'course'),
+    'chapters': (CourseChapter, 'course'),
+    'contents': (ChapterContent, 'chapter__course'),
+}
+
+
+# Largest value a bigint primary key can hold; bigger ids overflow the query.
+MAX_ID = 2 ** 63 - 1
+
+
+def parse_order_ids(values):
+    """Keep the first occurrence of each valid id, in order
+
+    Values that are not positive integers within the bigint range are dropped.
+    """
+    ids = {}
+    for value in values:
+        if isinstance(value, bool):
+            continue
+        try:
+            pk = int(value)
+        except (TypeError, ValueError, OverflowError):
+            continue
+        if 0 < pk <= MAX_ID:
+            ids.setdefault(pk, None)
+    return list(ids)
+
+
+def reorder(kind, course, ordered_ids):
+    """Number ``ordered_ids`` 1..n in a single UPDATE, ignoring ids outside ``course``
+
+    Returns the number of rows updated.
+    """
+    model, course_lookup = REORDERABLE[kind]
+    ids = parse_order_ids(ordered_ids)
+    if not ids:
+        return 0
+    position = Case(
+        *[When(pk=pk, then=Value(index)) for index, pk in enumerate(ids, start=1)],
+        output_field=IntegerField(),
+    )
+    with transaction.atomic():
+        updated = model.objects.filter(pk__in=ids, **{course_lookup: course}).update(order=position)
+    if kind != 'materials':
+        # Queryset updates skip the post_save receivers that drop the outline.
+        invalidate_course_outline(course.id)
+    return updated
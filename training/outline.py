@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.db.models import Count, Prefetch
+from django.urls import reverse
+
+from .models import CourseChapter, Quiz
+
+
+OUTLINE_SCHEMA_VERSION = 2
+OUTLINE_CACHE_KEY = 'training:course_outline:v{schema}:{course_id}'
+OUTLINE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _outline_cache_key(course_id):
+    return OUTLINE_CACHE_KEY.format(schema=OUTLINE_SCHEMA_VERSION, course_id=course_id)
+
+
+def _serialize_quiz(quiz):
+    return {
+        'id': quiz.id,
+        'title': quiz.title,
+        'pass_score': quiz.pass_score,
+        'question_count': quiz.question_count,
+    }
+
+
+def _serialize_chapter(chapter):
+    return {
+        'id': chapter.id,
+        'title': chapter.title,
+        'description': chapter.description,
+        'order': chapter.order,
+        'contents': [
+            {
+                'id': content.id,
+                'title': content.title,
+                'content_type': content.content_type,
+                'content_type_label': content.get_content_type_display(),
+                'text_content': content.text_content,
+                'video_url': content.video_url,
+                'file_url': reverse('courses:content_file', args=[content.id]) if content.file else '',
+            }
+            for content in chapter.contents.all()
+        ],
+        'quizzes': [_serialize_quiz(quiz) for quiz in chapter.quizzes.all()],
+    }
+
+
+def build_course_outlines(course_ids):
+    """Serialize the chapters, contents and quizzes of several courses into plain dicts, keyed by course id"""
+    course_ids = list(course_ids)
+    quizzes = Quiz.objects.annotate(question_count=Count('questions')).order_by('id')
+    chapters = CourseChapter.objects.filter(course_id__in=course_ids).prefetch_related(
+        'contents',
+        Prefetch('quizzes', queryset=quizzes),
+    )
+    outline_chapters = {course_id: [] for course_id in course_ids}
+    for chapter in chapters:
+        outline_chapters[chapter.course_id].append(_serialize_chapter(chapter))
+    final_exams = {}
+    for quiz in quizzes.filter(course_id__in=course_ids, quiz_type='final'):
+        final_exams.setdefault(quiz.course_id, quiz)
+    return {
+        course_id: {
+            'chapters': outline_chapters[course_id],
+            'chapter_ids': [chapter['id'] for chapter in outline_chapters[course_id]],
+            'final_exam': _serialize_quiz(final_exams[course_id]) if course_id in final_exams else None,
+        }
+        for course_id in course_ids
+    }
+
+
+def build_course_outline(course_id):
+    return build_course_outlines([course_id])[course_id]
+
+
+def get_course_outline(course_id):
+    cache_key = _outline_cache_key(course_id)
+    outline = cache.get(cache_key)
+    if outline is None:
+        outline = build_course_outline(course_id)
+        cache.set(cache_key, outline, OUTLINE_CACHE_TIMEOUT)
+    return outline
+
+
+def get_course_outlines(course_ids):
+    """Outlines for several courses: one cache round trip, then one build for all misses"""
+    keys = {course_id: _outline_cache_key(course_id) for course_id in course_ids}
+    cached = cache.get_many(list(keys.values()))
+    outlines = {course_id: cached[key] for course_id, key in keys.items() if key in cached}
+    missing = [course_id for course_id in keys if course_id not in outlines]
+    if missing:
+        built = build_course_outlines(missing)
+        cache.set_many({keys[course_id]: outline for course_id, outline in built.items()}, OUTLINE_CACHE_TIMEOUT)
+        outlines.update(built)
+    return outlines
+
+
+def invalidate_course_outline(course_id):
+    if course_id is not None:
+        cache.delete(_outline_cache_key(course_id))
@@ -0,0 +1,152 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import ChapterProgress, Enrollment, QuizAttempt
+from .outline import get_course_outlines
+
+
+LEARNING_PROGRESS_CACHE_KEY = 'training:learning_progress:{student_id}'
+LEARNING_PROGRESS_CACHE_TIMEOUT = 60 * 60
+
+
+def complete_chapter(enrollment, chapter):
+    """Mark a chapter completed, counting it on the enrollment only the first time"""
+    progress, _ = ChapterProgress.objects.get_or_create(enrollment=enrollment, chapter=chapter)
+    with transaction.atomic():
+        newly_completed = ChapterProgress.objects.filter(pk=progress.pk, is_completed=False).update(
+            is_completed=True,
+            completed_at=timezone.now(),
+        )
+        if newly_completed:
+            Enrollment.objects.filter(pk=enrollment.pk).update(
+                completed_chapter_count=F('completed_chapter_count') + 1,
+            )
+            enrollment.completed_chapter_count += 1
+    if newly_completed:
+        invalidate_learning_progress(enrollment.student_id)
+    return progress
+
+
+def record_quiz_attempt(enrollment, quiz, score, passed):
+    """Store an attempt, counting the quiz as passed on the enrollment only once"""
+    with transaction.atomic():
+        Enrollment.objects.select_for_update().filter(pk=enrollment.pk).first()
+        first_pass = passed and not QuizAttempt.objects.filter(enrollment=enrollment, quiz=quiz, passed=True).exists()
+        attempt = QuizAttempt.objects.create(enrollment=enrollment, quiz=quiz, score=score, passed=passed)
+        if first_pass:
+            Enrollment.objects.filter(pk=enrollment.pk).update(passed_quiz_count=F('passed_quiz_count') + 1)
+            enrollment.passed_quiz_count += 1
+    invalidate_learning_progress(enrollment.student_id)
+    return attempt
+
+
+def _completed_chapter_count():
+    return Coalesce(
+        Subquery(
+            ChapterProgress.objects.filter(enrollment=OuterRef('pk'), is_completed=True)
+            .values('enrollment')
+            .annotate(total=Count('id'))
+            .values('total')
+        ),
+        0,
+    )
+
+
+def _passed_quiz_count():
+    return Coalesce(
+        Subquery(
+            QuizAttempt.objects.filter(enrollment=OuterRef('pk'), passed=True)
+            .values('enrollment')
+            .annotate(total=Count('quiz', distinct=True))
+            .values('total')
+        ),
+        0,
+    )
+
+
+def recompute_progress_counters(enrollments=None):
+    """Rebuild the counters from ChapterProgress and QuizAttempt, returning rows updated"""
+    if enrollments is None:
+        enrollments = Enrollment.objects.all()
+    return enrollments.update(
+        completed_chapter_count=_completed_chapter_count(),
+        passed_quiz_count=_passed_quiz_count(),
+    )
+
+
+def _learning_cache_key(student_id):
+    return LEARNING_PROGRESS_CACHE_KEY.format(student_id=student_id)
+
+
+def build_learning_progress(student_id):
+    """Snapshot a student's enrollments with completed chapters and last activity, in three queries"""
+    enrollments = list(
+        Enrollment.objects.filter(student_id=student_id).values(
+            'id', 'course_id', 'course__title', 'course__slug', 'enrolled_at', 'is_completed',
+        )
+    )
+    completed = {}
+    last_activity = {}
+    for enrollment_id, chapter_id, completed_at in ChapterProgress.objects.filter(
+        enrollment__student_id=student_id, is_completed=True
+    ).values_list('enrollment_id', 'chapter_id', 'completed_at'):
+        completed.setdefault(enrollment_id, set()).add(chapter_id)
+        if completed_at and (enrollment_id not in last_activity or completed_at > last_activity[enrollment_id]):
+            last_activity[enrollment_id] = completed_at
+    for enrollment_id, attempted_at in (
+        QuizAttempt.objects.filter(enrollment__student_id=student_id)
+        .values('enrollment_id')
+        .annotate(last=Max('completed_at'))
+        .values_list('enrollment_id', 'last')
+    ):
+        if enrollment_id not in last_activity or attempted_at > last_activity[enrollment_id]:
+            last_activity[enrollment_id] = attempted_at
+    return [
+        {
+            'enrollment_id': row['id'],
+            'course_id': row['course_id'],
+            'course_title': row['course__title'],
+            'course_slug': row['course__slug'],
+            'enrolled_at': row['enrolled_at'],
+            'is_completed': row['is_completed'],
+            'completed_chapter_ids': completed.get(row['id'], set()),
+            'last_activity': last_activity.get(row['id'], row['enrolled_at']),
+        }
+        for row in enrollments
+    ]
+
+
+def get_learning_progress(student_id):
+    """Per-enrollment progress for the learning dashboard
+
+    The student snapshot is cached; chapter lists come from the cached course
+    outlines, so course edits show up without touching every student's entry.
+    """
+    cache_key = _learning_cache_key(student_id)
+    snapshot = cache.get(cache_key)
+    if snapshot is None:
+        snapshot = build_learning_progress(student_id)
+        cache.set(cache_key, snapshot, LEARNING_PROGRESS_CACHE_TIMEOUT)
+    outlines = get_course_outlines({entry['course_id'] for entry in snapshot})
+    progress = []
+    for entry in snapshot:
+        chapters = outlines[entry['course_id']]['chapters']
+        done = entry['completed_chapter_ids']
+        next_chapter = next((chapter for chapter in chapters if chapter['id'] not in done), None)
+        if entry['is_completed'] or not chapters:
+            percent = 100 if entry['is_completed'] else 0
+        else:
+            percent = int(sum(1 for chapter in chapters if chapter['id'] in done) / len(chapters) * 100)
+        progress.append({
+            **entry,
+            'progress_percent': percent,
+            'next_chapter': None if entry['is_completed'] else next_chapter,
+        })
+    return progress
+
+
+def invalidate_learning_progress(*student_ids):
+    cache.delete_many([_learning_cache_key(student_id) for student_id in student_ids])
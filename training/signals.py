@@ -0,0 +1,128 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .certificates import queue_certificate_pdf
+from .course_counts import adjust_enrollment_count, refresh_course_counts
+from .grading import invalidate_answer_key
+from .models import (
+    Certificate,
+    Course,
+    ChapterContent,
+    ChapterProgress,
+    Choice,
+    CourseChapter,
+    CourseMaterial,
+    Enrollment,
+    Question,
+    Quiz,
+    QuizAttempt,
+)
+from .outline import invalidate_course_outline
+from .progress import invalidate_learning_progress, recompute_progress_counters
+
+
+def _deleted_via(origin, model):
+    """Whether the delete that fired a signal was started on ``model`` rows"""
+    return isinstance(origin, model) or (isinstance(origin, QuerySet) and origin.model is model)
+
+
+def _recompute_course_progress(course_id):
+    """Rebuild the progress counters of every enrollment in a course with one UPDATE"""
+    enrollments = Enrollment.objects.filter(course_id=course_id)
+    recompute_progress_counters(enrollments)
+    invalidate_learning_progress(*enrollments.values_list('student_id', flat=True))
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def quiz_changed(sender, instance, **kwargs):
+    invalidate_answer_key(instance.id)
+    invalidate_course_outline(instance.course_id)
+    refresh_course_counts(instance.course_id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def quiz_question_changed(sender, instance, **kwargs):
+    invalidate_answer_key(instance.quiz_id)
+    invalidate_course_outline(Quiz.objects.filter(pk=instance.quiz_id).values_list('course_id', flat=True).first())
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def quiz_choice_changed(sender, instance, **kwargs):
+    quiz_id = Question.objects.filter(pk=instance.question_id).values_list('quiz_id', flat=True).first()
+    if quiz_id is not None:
+        invalidate_answer_key(quiz_id)
+
+
+@receiver(post_save, sender=CourseChapter)
+@receiver(post_delete, sender=CourseChapter)
+def course_chapter_changed(sender, instance, **kwargs):
+    invalidate_course_outline(instance.course_id)
+    refresh_course_counts(instance.course_id)
+
+
+@receiver(post_save, sender=ChapterContent)
+@receiver(post_delete, sender=ChapterContent)
+def chapter_content_changed(sender, instance, **kwargs):
+    course_id = CourseChapter.objects.filter(pk=instance.chapter_id).values_list('course_id', flat=True).first()
+    invalidate_course_outline(course_id)
+    refresh_course_counts(course_id)
+
+
+@receiver(post_save, sender=CourseMaterial)
+@receiver(post_delete, sender=CourseMaterial)
+def course_material_changed(sender, instance, **kwargs):
+    refresh_course_counts(instance.course_id)
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_enrollment_count(instance.course_id, 1)
+    invalidate_learning_progress(instance.student_id)
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    adjust_enrollment_count(instance.course_id, -1)
+    invalidate_learning_progress(instance.student_id)
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_learning_progress(*instance.enrollments.values_list('student_id', flat=True))
+
+
+@receiver(post_delete, sender=CourseChapter)
+@receiver(post_delete, sender=Quiz)
+def progress_source_deleted(sender, instance, origin=None, **kwargs):
+    # Their progress rows were deleted first and skipped their own receiver;
+    # a deleted course takes its enrollments with it.
+    if not _deleted_via(origin, Course):
+        _recompute_course_progress(instance.course_id)
+
+
+@receiver(post_delete, sender=ChapterProgress)
+@receiver(post_delete, sender=QuizAttempt)
+def progress_record_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleted_via(origin, sender):
+        # Cascades are recomputed per course, or drop the enrollment itself.
+        return
+    enrollments = Enrollment.objects.filter(pk=instance.enrollment_id)
+    recompute_progress_counters(enrollments)
+    invalidate_learning_progress(*enrollments.values_list('student_id', flat=True))
+
+
+@receiver(post_save, sender=Certificate)
+def certificate_saved(sender, instance, **kwargs):
+    queue_certificate_pdf(instance.id)
+
+
+@receiver(post_delete, sender=Certificate)
+def certificate_deleted(sender, instance, **kwargs):
+    if instance.pdf_file:
+        instance.pdf_file.delete(save=False)
@@ -1,8 +1,5 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse
-from django.template.loader import get_template
-from io import BytesIO
-from xhtml2pdf import pisa
+from django.http import Http404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
@@ -10,26 +7,28 @@ from django.utils.text import slugify
 from .models import (
     Course,
     Enrollment,
-    Certificate,
     CourseChapter,
     ChapterContent,
+    CourseMaterial,
     ChapterProgress,
     Quiz,
     Question,
     Choice,
     QuizAttempt,
 )
+from .certificates import certificate_pdf_ready, issue_certificate
+from .delivery import serve_file
+from .grading import get_answer_key, grade_submission
+from .outline import get_course_outline
+from .progress import complete_chapter, get_learning_progress, record_quiz_attempt
 from .forms import CourseForm, ChapterForm, ChapterContentForm, QuizForm, QuestionForm, ChoiceForm
 
 
 from django.core.paginator import Paginator
-from django.db.models import Count
 
 def index(request):
     """Course index page"""
-    courses_list = Course.objects.filter(is_active=True).select_related('instructor').annotate(
-        lesson_count=Count('chapters__contents')
-    ).order_by('-created_at')
+    courses_list = Course.objects.filter(is_active=True).select_related('instructor').order_by('-created_at')
     
     paginator = Paginator(courses_list, 12)
     page_number = request.GET.get('page')
@@ -72,7 +71,7 @@ def learning_dashboard(request):
         messages.error(request, 'Only students can access the learning dashboard.')
         return redirect('courses:index')
     
-    enrollments = Enrollment.objects.filter(student=request.user).select_related('course')
+    enrollments = get_learning_progress(request.user.id)
     
     context = {
         'page_title': 'My Learning Dashboard',
@@ -93,12 +92,12 @@ def course_detail(request, slug):
             student=request.user
         ).exists()
     
-    chapters = course.chapters.prefetch_related('contents', 'quizzes__questions')
+    outline = get_course_outline(course.id)
     context = {
         'page_title': course.title,
         'course': course,
         'is_enrolled': is_enrolled,
-        'chapters': chapters,
+        'chapters': outline['chapters'],
     }
     return render(request, 'training/course_detail.html', context)
 
@@ -136,22 +135,23 @@ def course_learn(request, slug):
         messages.error(request, 'You must enroll in this course first.')
         return redirect('courses:course_detail', slug=slug)
     
-    chapters = course.chapters.prefetch_related('contents', 'quizzes__questions__choices')
-    progress_records = ChapterProgress.objects.filter(enrollment=enrollment)
-    completed_chapter_ids = set(progress_records.filter(is_completed=True).values_list('chapter_id', flat=True))
-    total_chapters = chapters.count()
-    completed_chapters = ChapterProgress.objects.filter(enrollment=enrollment, is_completed=True).count()
+    outline = get_course_outline(course.id)
+    completed_chapter_ids = set(
+        ChapterProgress.objects.filter(enrollment=enrollment, is_completed=True).values_list('chapter_id', flat=True)
+    )
+    total_chapters = len(outline['chapter_ids'])
+    completed_chapters = len(completed_chapter_ids.intersection(outline['chapter_ids']))
     progress_percent = int((completed_chapters / total_chapters) * 100) if total_chapters else 0
-    final_exam = course.quizzes.filter(quiz_type='final').first()
+    final_exam = outline['final_exam']
     final_attempt = None
     if final_exam:
-        final_attempt = QuizAttempt.objects.filter(enrollment=enrollment, quiz=final_exam).first()
+        final_attempt = QuizAttempt.objects.filter(enrollment=enrollment, quiz_id=final_exam['id']).first()
     
     context = {
         'page_title': f'Learning: {course.title}',
         'course': course,
         'enrollment': enrollment,
-        'chapters': chapters,
+        'chapters': outline['chapters'],
         'completed_chapter_ids': completed_chapter_ids,
         'final_exam': final_exam,
         'final_attempt': final_attempt,
@@ -176,26 +176,36 @@ def download_certificate(request, slug):
         messages.error(request, 'Course must be completed to download certificate.')
         return redirect('courses:course_detail', slug=slug)
     
-    certificate, created = Certificate.objects.get_or_create(
-        enrollment=enrollment,
-        defaults={'certificate_id': f"CERT-{enrollment.id}-{timezone.now().strftime('%Y%m%d')}"}
-    )
-    context = {
-        'course': course,
-        'enrollment': enrollment,
-        'certificate': certificate,
-    }
-    template = get_template('training/certificate_pdf.html')
-    html = template.render(context)
-    result = BytesIO()
-    pdf = pisa.pisaDocument(BytesIO(html.encode('UTF-8')), result)
-    if pdf.err:
-        messages.error(request, 'Unable to generate certificate PDF.')
-        return redirect('courses:course_detail', slug=slug)
+    certificate = issue_certificate(enrollment)
+    if not certificate_pdf_ready(certificate):
+        messages.info(request, 'Your certificate is being prepared. Please try again in a moment.')
+        return redirect('courses:course_learn', slug=slug)
+    # Served through this view rather than the media URL so only the enrolled student gets it.
+    return serve_file(request, certificate.pdf_file, filename=f'certificate-{course.slug}.pdf', as_attachment=True)
 
-    response = HttpResponse(result.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="certificate-{course.slug}.pdf"'
-    return response
+
+def _can_access_course_files(user, course):
+    if user.is_administrator or user.id in (course.created_by_id, course.instructor_id):
+        return True
+    return Enrollment.objects.filter(course=course, student=user).exists()
+
+
+@login_required
+def content_file(request, content_id):
+    """Stream a chapter content file to enrolled students"""
+    content = get_object_or_404(ChapterContent.objects.select_related('chapter__course'), id=content_id)
+    if not content.file or not _can_access_course_files(request.user, content.chapter.course):
+        raise Http404
+    return serve_file(request, content.file)
+
+
+@login_required
+def material_file(request, material_id):
+    """Stream a course material file to enrolled students"""
+    material = get_object_or_404(CourseMaterial.objects.select_related('course'), id=material_id)
+    if not material.file or not _can_access_course_files(request.user, material.course):
+        raise Http404
+    return serve_file(request, material.file)
 
 
 @login_required
@@ -625,22 +635,15 @@ def choice_delete(request, choice_id):
 
 
 def _check_completion(enrollment):
-    chapters = enrollment.course.chapters.all()
-    completed_chapters = ChapterProgress.objects.filter(enrollment=enrollment, is_completed=True).count()
-    if chapters.count() != completed_chapters:
+    course = enrollment.course
+    if enrollment.completed_chapter_count < course.chapter_count:
+        return False
+    if enrollment.passed_quiz_count < course.quiz_count:
         return False
-    quizzes = enrollment.course.quizzes.all()
-    for quiz in quizzes:
-        attempt = QuizAttempt.objects.filter(enrollment=enrollment, quiz=quiz, passed=True).first()
-        if not attempt:
-            return False
     enrollment.is_completed = True
     enrollment.completed_at = timezone.now()
-    enrollment.save()
-    Certificate.objects.get_or_create(
-        enrollment=enrollment,
-        defaults={'certificate_id': f"CERT-{enrollment.id}-{timezone.now().strftime('%Y%m%d')}"}
-    )
+    enrollment.save(update_fields=['is_completed', 'completed_at'])
+    issue_certificate(enrollment)
     return True
 
 
@@ -656,10 +659,7 @@ def mark_chapter_complete(request, chapter_id):
         messages.error(request, 'You must enroll in this course first.')
         return redirect('courses:course_detail', slug=chapter.course.slug)
 
-    progress, _ = ChapterProgress.objects.get_or_create(enrollment=enrollment, chapter=chapter)
-    progress.is_completed = True
-    progress.completed_at = timezone.now()
-    progress.save()
+    complete_chapter(enrollment, chapter)
     _check_completion(enrollment)
     messages.success(request, 'Chapter marked as completed.')
     return redirect('courses:course_learn', slug=chapter.course.slug)
@@ -678,26 +678,12 @@ def take_quiz(request, quiz_id):
         return redirect('courses:course_detail', slug=quiz.course.slug)
 
     if request.method == 'POST':
-        total = quiz.questions.count()
-        correct = 0
-        for question in quiz.questions.all():
-            answer = request.POST.get(f'question_{question.id}')
-            if answer:
-                try:
-                    choice = Choice.objects.get(id=int(answer), question=question)
-                    if choice.is_correct:
-                        correct += 1
-                except (Choice.DoesNotExist, ValueError):
-                    pass
-        score = int((correct / total) * 100) if total else 0
+        score = grade_submission(get_answer_key(quiz.id), request.POST)
         passed = score >= quiz.pass_score
-        QuizAttempt.objects.create(enrollment=enrollment, quiz=quiz, score=score, passed=passed)
+        record_quiz_attempt(enrollment, quiz, score, passed)
         if passed:
             if quiz.chapter:
-                progress, _ = ChapterProgress.objects.get_or_create(enrollment=enrollment, chapter=quiz.chapter)
-                progress.is_completed = True
-                progress.completed_at = timezone.now()
-                progress.save()
+                complete_chapter(enrollment, quiz.chapter)
             messages.success(request, f'Quiz passed with {score}%.')
         else:
             messages.error(request, f'Quiz failed with {score}%. Try again.')